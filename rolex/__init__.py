@@ -9,25 +9,84 @@ __maintainer__ = "Sanhe Hu"
 __maintainer_email__ = "husanhe@gmail.com"
 __github_username__ = "MacHu-GWU"
 
-try:
-    from .generator import (
-        time_series, weekday_series,
-        rnd_date, rnd_date_array, rnd_datetime, rnd_datetime_array,
-    )
-    from .math import (
-        add_seconds, add_minutes, add_hours, add_days, add_weeks,
-        add_months, add_years,
-        round_to,
-    )
-    from .parse import parser
-    str2date = parser.str2date
-    str2datetime = parser.str2datetime
-    parse_date = parser.parse_date
-    parse_datetime = parser.parse_datetime
-    from .tz import utc, local
-    from .util import (
-        to_ordinal, from_ordinal, to_utctimestamp, from_utctimestamp,
-        to_utc, utc_to_tz, utc_to_local,
-    )
-except ImportError:  # pragma: no cover
-    pass
+import importlib
+import sys
+
+#: public name -> (submodule, attribute), loaded on first access
+_lazy_attributes = dict()
+for _module_name, _names in [
+    ("business", [
+        "HolidayCalendar", "is_business_day", "add_business_days",
+        "business_days_between", "is_business_day_many",
+        "add_business_days_many", "business_days_between_many",
+    ]),
+    ("format", [
+        "datetime2str", "date2str", "datetime2str_many", "date2str_many",
+    ]),
+    ("generator", [
+        "time_series", "weekday_series",
+        "rnd_date", "rnd_date_array", "rnd_datetime", "rnd_datetime_array",
+    ]),
+    ("math", [
+        "add_seconds", "add_minutes", "add_hours", "add_days", "add_weeks",
+        "add_seconds_many", "add_minutes_many", "add_hours_many",
+        "add_days_many", "add_weeks_many",
+        "add_months", "add_years", "add_months_many", "add_years_many",
+        "diff_days", "diff_weeks", "diff_months", "diff_years",
+        "diff_days_many", "diff_weeks_many", "diff_months_many",
+        "diff_years_many",
+        "round_to", "floor_to_freq", "ceil_to_freq", "round_to_freq",
+        "floor_to_freq_many", "ceil_to_freq_many", "round_to_freq_many",
+    ]),
+    ("parse", ["parser"]),
+    ("tz", ["utc", "local"]),
+    ("util", [
+        "to_ordinal", "from_ordinal", "to_utctimestamp", "from_utctimestamp",
+        "to_utc", "utc_to_tz", "utc_to_local",
+    ]),
+]:
+    for _name in _names:
+        _lazy_attributes[_name] = (_module_name, _name)
+for _name in ["str2date", "str2datetime", "parse_date", "parse_datetime"]:
+    _lazy_attributes[_name] = ("parse", "parser." + _name)
+
+#: ``from rolex import *`` goes through the module ``__getattr__``
+__all__ = sorted(_lazy_attributes)
+
+#: submodules, ``rolex.math`` etc. work after a plain ``import rolex``
+_submodules = (
+    "business", "cache", "format", "generator", "lazy", "math", "parse",
+    "pkg", "stats", "template", "tz", "util",
+)
+
+
+def __getattr__(name):
+    """
+    Import the submodule on first access of a public name, so ``import
+    rolex`` doesn't load numpy, :mod:`dateutil.parser` or the local time
+    zone.
+    """
+    if name in _submodules:
+        return importlib.import_module("." + name, __name__)
+    try:
+        module_name, attribute = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name))
+    value = importlib.import_module("." + module_name, __name__)
+    for part in attribute.split("."):
+        value = getattr(value, part)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) | set(_submodules))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    try:
+        for _name in _lazy_attributes:
+            __getattr__(_name)
+    except ImportError:
+        pass
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+
+"""
+Business day arithmetic.
+
+A :class:`HolidayCalendar` stores the holidays as a sorted array of date
+ordinals. Weekend days are handled by week arithmetic, holidays by binary
+search, so counting or shifting business days over any range is
+``O(log n)`` of the number of holidays, not one step per day.
+
+**中文文档**
+
+工作日计算。:class:`HolidayCalendar` 将节假日保存为有序的日期序数数组。
+周末用整周的算术计算, 节假日用二分查找, 所以计算任意长区间的工作日数, 或是
+平移 N 个工作日, 复杂度都是节假日数量的 ``O(log n)``, 而不是逐日循环。
+"""
+
+import numbers
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from itertools import repeat
+
+try:
+    from .lazy import require_numpy
+    from .parse import parser
+    from .pkg import sixmini
+except:  # pragma: no cover
+    from rolex.lazy import require_numpy
+    from rolex.parse import parser
+    from rolex.pkg import sixmini
+
+#: ordinal of 1970-01-01, numpy datetime64[D] is days since it
+_epoch_ordinal = date(1970, 1, 1).toordinal()
+
+
+class HolidayCalendar(object):
+    """
+    Weekend days and holidays.
+
+    :param holidays: iterable of date like objects, see
+        :meth:`rolex.parse.Parser.parse_date`.
+    :param weekend: weekday numbers of weekend, Monday is 0 and Sunday is 6.
+
+    Usage::
+
+        >>> calendar = HolidayCalendar(["2014-01-01", "2014-12-25"])
+        >>> add_business_days("2013-12-31", 1, calendar)
+        datetime.date(2014, 1, 2)
+
+    **中文文档**
+
+    工作日日历, 包括周末是哪几天, 以及节假日。节假日以有序的日期序数数组保存,
+    只保留落在非周末的节假日, 因为周末本来就不是工作日。
+    """
+
+    def __init__(self, holidays=(), weekend=(5, 6)):
+        weekend = sorted(set(weekend))
+        for weekday in weekend:
+            if weekday not in range(7):
+                raise ValueError("weekday has to be in 0 ~ 6, got %r!" %
+                                 weekday)
+        self.weekend = tuple(weekend)
+        #: weekday numbers of business days, ascending
+        self._weekdays = [i for i in range(7) if i not in weekend]
+        if not self._weekdays:
+            raise ValueError("a week has to have at least one business day!")
+        #: weekday -> position in ``_weekdays``, None for weekend
+        self._position = [
+            self._weekdays.index(i) if i in self._weekdays else None
+            for i in range(7)
+        ]
+        #: weekday -> number of business weekdays before it in a week
+        self._before = [
+            len([i for i in self._weekdays if i < weekday])
+            for weekday in range(8)
+        ]
+        self._per_week = len(self._weekdays)
+        self._ordinals = array("l")
+        self._np_calendar = None
+        self.add(holidays)
+
+    def __repr__(self):
+        return "%s(holidays=%r, weekend=%r)" % (
+            self.__class__.__name__, self.holidays, self.weekend)
+
+    @property
+    def holidays(self):
+        """
+        Holidays on business weekdays, ascending list of date.
+        """
+        return [date.fromordinal(ordinal) for ordinal in self._ordinals]
+
+    def add(self, holidays):
+        """
+        Add holidays to the calendar.
+
+        :param holidays: iterable of date like objects.
+        """
+        ordinals = set(self._ordinals)
+        for holiday in holidays:
+            ordinal = parser.parse_date(holiday).toordinal()
+            if self._position[(ordinal + 6) % 7] is not None:
+                ordinals.add(ordinal)
+        self._ordinals = array("l", sorted(ordinals))
+        self._np_calendar = None
+
+    def _is_business_day(self, ordinal):
+        if self._position[(ordinal + 6) % 7] is None:
+            return False
+        i = bisect_left(self._ordinals, ordinal)
+        return i == len(self._ordinals) or self._ordinals[i] != ordinal
+
+    def _weekdays_before(self, ordinal):
+        """
+        Number of business weekdays in [0001-01-01, ordinal), ignoring
+        holidays. 0001-01-01 is a Monday.
+        """
+        weeks, weekday = divmod(ordinal - 1, 7)
+        return weeks * self._per_week + self._before[weekday]
+
+    def _count(self, start, end):
+        """
+        Number of business days in [start, end), negative if end < start.
+        """
+        if end < start:
+            return -self._count(end, start)
+        ordinals = self._ordinals
+        return self._weekdays_before(end) - self._weekdays_before(start) \
+            - (bisect_left(ordinals, end) - bisect_left(ordinals, start))
+
+    def _shift_weekdays(self, ordinal, n):
+        """
+        Shift a business weekday by n business weekdays, ignoring holidays.
+        """
+        weeks, weekday = divmod(ordinal - 1, 7)
+        weeks, position = divmod(
+            weeks * self._per_week + self._position[weekday] + n,
+            self._per_week)
+        return weeks * 7 + self._weekdays[position] + 1
+
+    def _roll(self, ordinal, forward):
+        """
+        The nearest business day on or after (before) the ordinal.
+        """
+        step = 1 if forward else -1
+        while not self._is_business_day(ordinal):
+            ordinal += step
+        return ordinal
+
+    def _offset(self, ordinal, n):
+        """
+        Shift by n business days, a non business day is rolled to the next
+        business day first (the previous one if n is negative).
+        """
+        ordinal = self._roll(ordinal, n >= 0)
+        if n == 0:
+            return ordinal
+        ordinals = self._ordinals
+        # skip weekends by arithmetic, then holidays passed by in the jump,
+        # each round the remaining holidays to skip get fewer
+        if n > 0:
+            while n:
+                target = self._shift_weekdays(ordinal, n)
+                n = bisect_right(ordinals, target) \
+                    - bisect_right(ordinals, ordinal)
+                ordinal = target
+        else:
+            while n:
+                target = self._shift_weekdays(ordinal, n)
+                n = bisect_left(ordinals, target) \
+                    - bisect_left(ordinals, ordinal)
+                ordinal = target
+        return ordinal
+
+    def _numpy_calendar(self):
+        if self._np_calendar is None:
+            np = require_numpy()
+            holidays = np.array(
+                [ordinal - _epoch_ordinal for ordinal in self._ordinals],
+                dtype=np.int64,
+            ).astype("datetime64[D]")
+            weekmask = [0 if i in self.weekend else 1 for i in range(7)]
+            self._np_calendar = np.busdaycalendar(
+                weekmask=weekmask, holidays=holidays)
+        return self._np_calendar
+
+
+#: weekend is Saturday and Sunday, no holiday
+default_calendar = HolidayCalendar()
+
+
+def _to_ordinal(date_like_object):
+    if isinstance(date_like_object, date):
+        return date_like_object.toordinal()
+    return parser.parse_date(date_like_object).toordinal()
+
+
+def _is_datetime64_array(value):
+    return getattr(getattr(value, "dtype", None), "kind", None) == "M"
+
+
+def _to_days(np, values):
+    """
+    Convert numpy datetime64 array, a date like object, or list of date like
+    objects to numpy datetime64[D].
+    """
+    if _is_datetime64_array(values):
+        return values.astype("datetime64[D]")
+    if isinstance(values, (sixmini.string_types, date)):
+        return np.datetime64(parser.parse_date(values), "D")
+    return np.array(
+        [parser.parse_date(value) for value in values],
+        dtype="datetime64[D]",
+    )
+
+
+def is_business_day(date_like_object, calendar=None):
+    """
+    Check if a date is a business day, not weekend and not holiday.
+
+    :param date_like_object: a date, datetime or date string.
+    :param calendar: :class:`HolidayCalendar`, default Saturday and Sunday
+        are weekend and there's no holiday.
+
+    **中文文档**
+
+    判断给定日期是否是工作日。
+    """
+    calendar = calendar or default_calendar
+    return calendar._is_business_day(_to_ordinal(date_like_object))
+
+
+def add_business_days(date_like_object, n, calendar=None):
+    """
+    Returns the date n business days after a date.
+
+    If the date itself is not a business day, it is rolled to the next
+    business day first (the previous business day if n is negative). So
+    ``n = 0`` returns the nearest business day on or after the date.
+
+    :param date_like_object: a date, datetime or date string.
+    :param n: number of business days, value can be negative.
+    :param calendar: :class:`HolidayCalendar`.
+    :return: date object, datetime if input is datetime, the time is kept.
+
+    **中文文档**
+
+    返回给定日期N个工作日之后的日期。
+    """
+    calendar = calendar or default_calendar
+    ordinal = _to_ordinal(date_like_object)
+    result = calendar._offset(ordinal, n)
+    if isinstance(date_like_object, datetime):
+        return date_like_object + timedelta(days=result - ordinal)
+    return date.fromordinal(result)
+
+
+def business_days_between(start, end, calendar=None):
+    """
+    Number of business days in [start, end), negative if end is before
+    start.
+
+    :param start: a date, datetime or date string.
+    :param end: a date, datetime or date string.
+    :param calendar: :class:`HolidayCalendar`.
+
+    **中文文档**
+
+    计算区间 [start, end) 之间的工作日数, 不包括 end。
+    """
+    calendar = calendar or default_calendar
+    return calendar._count(_to_ordinal(start), _to_ordinal(end))
+
+
+def is_business_day_many(date_like_objects, calendar=None):
+    """
+    Vectorized :func:`is_business_day`.
+
+    :param date_like_objects: list of date like objects, or numpy
+        datetime64 array.
+    :return: list of bool, or numpy bool array for numpy array, NaT is
+        not a business day.
+
+    **中文文档**
+
+    批量判断是否是工作日。numpy 数组使用 :func:`numpy.is_busday`。
+    """
+    calendar = calendar or default_calendar
+    if _is_datetime64_array(date_like_objects):
+        np = require_numpy()
+        return np.is_busday(
+            date_like_objects.astype("datetime64[D]"),
+            busdaycal=calendar._numpy_calendar(),
+        )
+    is_business = calendar._is_business_day
+    return [is_business(_to_ordinal(value)) for value in date_like_objects]
+
+
+def add_business_days_many(date_like_objects, n, calendar=None):
+    """
+    Vectorized :func:`add_business_days`.
+
+    :param date_like_objects: list of date like objects, or numpy
+        datetime64 array.
+    :param n: number of business days, an integer, or a list / array of
+        integers of the same length.
+    :return: list of date (datetime for datetime input), or numpy
+        datetime64[D] array for numpy array, NaT is kept.
+
+    **中文文档**
+
+    批量地将日期平移 N 个工作日。numpy 数组使用 :func:`numpy.busday_offset`。
+    """
+    calendar = calendar or default_calendar
+    if _is_datetime64_array(date_like_objects):
+        np = require_numpy()
+        days = date_like_objects.astype("datetime64[D]")
+        n = np.broadcast_to(np.asarray(n, dtype=np.int64), days.shape)
+        busdaycal = calendar._numpy_calendar()
+        result = np.empty(days.shape, dtype="datetime64[D]")
+        forward = n >= 0
+        result[forward] = np.busday_offset(
+            days[forward], n[forward], roll="forward", busdaycal=busdaycal)
+        result[~forward] = np.busday_offset(
+            days[~forward], n[~forward], roll="backward", busdaycal=busdaycal)
+        return result
+
+    if isinstance(n, numbers.Integral):
+        n = repeat(int(n))
+    else:
+        n = [int(days) for days in n]
+    offset = calendar._offset
+    results = list()
+    for value, days in zip(date_like_objects, n):
+        ordinal = _to_ordinal(value)
+        result = offset(ordinal, days)
+        if isinstance(value, datetime):
+            results.append(value + timedelta(days=result - ordinal))
+        else:
+            results.append(date.fromordinal(result))
+    return results
+
+
+def business_days_between_many(starts, ends, calendar=None):
+    """
+    Vectorized :func:`business_days_between`.
+
+    :param starts: list of date like objects, or numpy datetime64 array.
+    :param ends: list of date like objects, or numpy datetime64 array, or
+        a single date like object used for all starts.
+    :return: list of integer, or numpy integer array for numpy array,
+        NaT is not allowed.
+
+    **中文文档**
+
+    批量计算工作日数。numpy 数组使用 :func:`numpy.busday_count`。
+    """
+    calendar = calendar or default_calendar
+    if _is_datetime64_array(starts) or _is_datetime64_array(ends):
+        np = require_numpy()
+        starts, ends = _to_days(np, starts), _to_days(np, ends)
+        # numpy counts (end, start] if end < start, use -[end, start) instead
+        backward = ends < starts
+        counts = np.busday_count(
+            np.minimum(starts, ends), np.maximum(starts, ends),
+            busdaycal=calendar._numpy_calendar(),
+        )
+        return np.where(backward, -counts, counts)
+
+    count = calendar._count
+    if isinstance(ends, (sixmini.string_types, date)):
+        end = _to_ordinal(ends)
+        return [count(_to_ordinal(start), end) for start in starts]
+    return [
+        count(_to_ordinal(start), _to_ordinal(end))
+        for start, end in zip(starts, ends)
+    ]
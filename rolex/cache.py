@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bounded memoization cache for parsed strings.
+
+**中文文档**
+
+有容量上限的缓存, 用于记住已经解析过的字符串。
+"""
+
+from collections import OrderedDict
+
+_valid_policy = ["lru", "fifo"]
+
+
+class Cache(object):
+    """
+    A bounded cache with hit / miss counters.
+
+    :param size: max number of items.
+    :param policy: eviction policy, "lru" (least recently used) or
+        "fifo" (first in first out).
+
+    **中文文档**
+
+    有容量上限的缓存。容量满了以后, 按照 "lru" (最近最少使用) 或 "fifo"
+    (先进先出) 策略淘汰旧数据。
+    """
+
+    def __init__(self, size, policy="lru"):
+        policy = policy.lower()
+        if policy not in _valid_policy:
+            raise ValueError(
+                "'policy' has to be one of %r!" % _valid_policy)
+        if size <= 0:
+            raise ValueError("'size' has to be greater than zero!")
+        self.size = size
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lru = policy == "lru"
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        """
+        Get value by key, returns None if not found.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self._lru:
+            # OrderedDict.move_to_end is not available on Python 2.7
+            data = self._data
+            del data[key]
+            data[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        Put value into cache, evict the oldest item if it's full.
+        """
+        data = self._data
+        data[key] = value
+        if len(data) > self.size:
+            data.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all items and reset counters.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Returns cache statistics.
+
+        :return: dict with keys ``hits``, ``misses``, ``currsize``,
+            ``maxsize``, ``policy``.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "currsize": len(self._data),
+            "maxsize": self.size,
+            "policy": self.policy,
+        }
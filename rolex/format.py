@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+
+"""
+Format datetime to string, the inverse of :meth:`rolex.parse.Parser.str2datetime`.
+
+A strftime style template is precompiled into a specialized function, which
+renders the datetime with one ``%`` string formatting operation. Month and
+day names are English, they don't depend on ``LC_TIME``.
+
+**中文文档**
+
+将 datetime 格式化为字符串。strftime 风格的模板会被预编译为专用函数, 只需
+一次字符串格式化操作即可完成。批量格式化时, 连续的相同日期只会格式化一次
+日期部分。
+"""
+
+import io
+import itertools
+from datetime import timedelta
+
+try:
+    from .pkg import sixmini
+    from .template import _locale_names
+except:  # pragma: no cover
+    from rolex.pkg import sixmini
+    from rolex.template import _locale_names
+
+_month_names, _month_abbrs, _day_names, _day_abbrs = _locale_names["en"]
+
+#: directives only depend on the date part
+_date_directives = set("YymdBbAa")
+
+#: directive -> (format spec, expression on ``dt``)
+_directive_format = {
+    "Y": ("%04d", "dt.year"),
+    "y": ("%02d", "dt.year % 100"),
+    "m": ("%02d", "dt.month"),
+    "d": ("%02d", "dt.day"),
+    "H": ("%02d", "dt.hour"),
+    "I": ("%02d", "(dt.hour % 12 or 12)"),
+    "M": ("%02d", "dt.minute"),
+    "S": ("%02d", "dt.second"),
+    "f": ("%06d", "dt.microsecond"),
+    "p": ("%s", "_ampm[dt.hour >= 12]"),
+    "B": ("%s", "_month_names[dt.month - 1]"),
+    "b": ("%s", "_month_abbrs[dt.month - 1]"),
+    "A": ("%s", "_day_names[dt.weekday()]"),
+    "a": ("%s", "_day_abbrs[dt.weekday()]"),
+    "Z": ("%s", "(dt.tzname() or '')"),
+    "z": ("%s", "_format_offset(dt.utcoffset())"),
+}
+
+#: directive -> constant, when formatting a date object
+_date_constant = {
+    "H": "00",
+    "I": "12",
+    "M": "00",
+    "S": "00",
+    "f": "000000",
+    "p": "AM",
+    "Z": "",
+    "z": "",
+}
+
+_offset_strings = dict()
+_offset_strings_size = 1024
+
+
+def _format_offset(offset):
+    """
+    Format utc offset as ``+HHMM[SS[.ffffff]]``, the same as strftime ``%z``.
+    """
+    if offset is None:
+        return ""
+    try:
+        return _offset_strings[offset]
+    except KeyError:
+        pass
+    if offset < timedelta(0):
+        sign, delta = "-", -offset
+    else:
+        sign, delta = "+", offset
+    minutes, seconds = divmod(delta.days * 86400 + delta.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    text = "%s%02d%02d" % (sign, hours, minutes)
+    if seconds or delta.microseconds:
+        text += "%02d" % seconds
+        if delta.microseconds:
+            text += ".%06d" % delta.microseconds
+    if len(_offset_strings) < _offset_strings_size:
+        _offset_strings[offset] = text
+    return text
+
+
+_formatter_namespace = {
+    "_ampm": ("AM", "PM"),
+    "_month_names": _month_names,
+    "_month_abbrs": _month_abbrs,
+    "_day_names": _day_names,
+    "_day_abbrs": _day_abbrs,
+    "_format_offset": _format_offset,
+}
+
+
+class Formatter(object):
+    """
+    A precompiled datetime formatter.
+
+    :param template: strftime style template, supported directives are
+        ``%Y %y %m %d %H %I %M %S %f %p %B %b %A %a %Z %z %%``.
+
+    If the date directives are all at the beginning (or the end) of the
+    template, for example ``"%Y-%m-%d %H:%M:%S"``, bulk formatting renders
+    the date part once per distinct consecutive date, see
+    :meth:`Formatter.iter_format`.
+
+    **中文文档**
+
+    预编译的 datetime 格式化器。
+    """
+
+    def __init__(self, template):
+        self.template = template
+        pieces = self._split(template)
+        self._format = self._compile(pieces)
+        self._format_date = self._compile(pieces, date_only=True)
+
+        # find the date part, at the beginning or the end of the template
+        is_date = [
+            not is_directive or value in _date_directives
+            for is_directive, value in pieces
+        ]
+        self._date_first = None
+        if False in is_date:
+            first_time = is_date.index(False)
+            last_time = len(is_date) - is_date[::-1].index(False)
+            if self._directives(pieces[:first_time]) and \
+                    not self._directives(pieces[first_time:]):
+                self._date_first = True
+                split = first_time
+            elif self._directives(pieces[last_time:]) and \
+                    not self._directives(pieces[:last_time]):
+                self._date_first = False
+                split = last_time
+            if self._date_first is not None:
+                date_pieces = pieces[:split] if self._date_first \
+                    else pieces[split:]
+                time_pieces = pieces[split:] if self._date_first \
+                    else pieces[:split]
+                self._format_date_part = self._compile(date_pieces)
+                self._format_time_part = self._compile(time_pieces)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.template)
+
+    @staticmethod
+    def _split(template):
+        """
+        Split template into ``(is_directive, value)`` pieces, value is the
+        directive character or the literal string.
+        """
+        pieces = list()
+        literal = list()
+        i, length = 0, len(template)
+        while i < length:
+            char = template[i]
+            if char == "%":
+                if i + 1 >= length:
+                    raise ValueError("stray %% in template %r!" % template)
+                directive = template[i + 1]
+                i += 2
+                if directive == "%":
+                    literal.append("%")
+                    continue
+                if directive not in _directive_format:
+                    raise ValueError(
+                        "unsupported directive %%%s in template %r!" % (
+                            directive, template))
+                if literal:
+                    pieces.append((False, "".join(literal)))
+                    literal = list()
+                pieces.append((True, directive))
+            else:
+                literal.append(char)
+                i += 1
+        if literal:
+            pieces.append((False, "".join(literal)))
+        return pieces
+
+    @staticmethod
+    def _directives(pieces):
+        """
+        Date directives in the pieces.
+        """
+        return [
+            value for is_directive, value in pieces
+            if is_directive and value in _date_directives
+        ]
+
+    @staticmethod
+    def _compile(pieces, date_only=False):
+        """
+        Generate a function that takes a datetime and returns the string.
+
+        :param date_only: the argument is a date object, time directives
+            are rendered as midnight.
+        """
+        specs = list()
+        args = list()
+        for is_directive, value in pieces:
+            if not is_directive:
+                specs.append(value.replace("%", "%%"))
+            elif date_only and value in _date_constant:
+                specs.append(_date_constant[value])
+            else:
+                spec, expression = _directive_format[value]
+                specs.append(spec)
+                args.append(expression)
+        spec = "".join(specs)
+        if args:
+            source = "def format(dt):\n    return %r %% (%s,)\n" % (
+                spec, ", ".join(args))
+        else:
+            source = "def format(dt):\n    return %r\n" % (spec % (),)
+        namespace = dict(_formatter_namespace)
+        exec(source, namespace)
+        return namespace["format"]
+
+    def format(self, a_datetime):
+        """
+        Format a datetime to string.
+        """
+        return self._format(a_datetime)
+
+    def format_date(self, a_date):
+        """
+        Format a date to string, time directives are rendered as midnight.
+        """
+        return self._format_date(a_date)
+
+    def iter_format(self, datetimes):
+        """
+        Format many datetimes lazily. The date part is rendered only when
+        the date changes between consecutive datetimes.
+        """
+        if self._date_first is None:
+            for a_datetime in datetimes:
+                yield self._format(a_datetime)
+            return
+
+        format_date_part = self._format_date_part
+        format_time_part = self._format_time_part
+        last_ordinal = None
+        date_part = None
+        if self._date_first:
+            for a_datetime in datetimes:
+                ordinal = a_datetime.toordinal()
+                if ordinal != last_ordinal:
+                    date_part = format_date_part(a_datetime)
+                    last_ordinal = ordinal
+                yield date_part + format_time_part(a_datetime)
+        else:
+            for a_datetime in datetimes:
+                ordinal = a_datetime.toordinal()
+                if ordinal != last_ordinal:
+                    date_part = format_date_part(a_datetime)
+                    last_ordinal = ordinal
+                yield format_time_part(a_datetime) + date_part
+
+    def iter_format_date(self, dates):
+        """
+        Format many dates lazily.
+        """
+        format_date = self._format_date
+        for a_date in dates:
+            yield format_date(a_date)
+
+
+_formatters = dict()
+
+
+def get_formatter(template):
+    """
+    Get the precompiled :class:`Formatter` of a template, formatters are
+    cached by template.
+    """
+    try:
+        return _formatters[template]
+    except KeyError:
+        formatter = _formatters[template] = Formatter(template)
+        return formatter
+
+
+def datetime2str(a_datetime, template="%Y-%m-%d %H:%M:%S"):
+    """
+    Format a datetime to string.
+
+    :param a_datetime: a datetime object.
+    :param template: strftime style template, any template in
+        :data:`rolex.parse.datetime_template_list` works.
+    :return: a string.
+
+    **中文文档**
+
+    将 datetime 格式化为字符串, 比 :meth:`datetime.strftime` 快。
+    """
+    return get_formatter(template)._format(a_datetime)
+
+
+def date2str(a_date, template="%Y-%m-%d"):
+    """
+    Format a date to string.
+
+    :param a_date: a date object.
+    :param template: strftime style template, any template in
+        :data:`rolex.parse.date_template_list` works.
+    :return: a string.
+
+    **中文文档**
+
+    将 date 格式化为字符串, 比 :meth:`date.strftime` 快。
+    """
+    return get_formatter(template)._format_date(a_date)
+
+
+def _output(strings, sep, path_or_file, encoding, chunksize):
+    """
+    Collect formatted strings as list, joined string, or write them to
+    file, each string is followed by ``sep``.
+    """
+    if path_or_file is None:
+        if sep is None:
+            return list(strings)
+        return sep.join(strings)
+
+    if sep is None:
+        sep = "\n"
+    if isinstance(path_or_file, sixmini.string_types):
+        with io.open(path_or_file, "w", encoding=encoding, newline="") as f:
+            return _output(strings, sep, f, encoding, chunksize)
+
+    f = path_or_file
+    count = 0
+    while True:
+        chunk = list(itertools.islice(strings, chunksize))
+        if not chunk:
+            break
+        f.write(sep.join(chunk) + sep)
+        count += len(chunk)
+    return count
+
+
+def datetime2str_many(datetimes, template="%Y-%m-%d %H:%M:%S", sep=None,
+                      path_or_file=None, encoding="utf-8", chunksize=65536):
+    """
+    Format many datetimes to string.
+
+    :param datetimes: iterable of datetime object.
+    :param template: strftime style template.
+    :param sep: if given, returns one string joined by ``sep``.
+    :param path_or_file: if given, file path or text file object, strings
+        are written to it, each followed by ``sep`` (default newline).
+    :param encoding: file encoding, used with file path.
+    :param chunksize: number of strings written to the file at once.
+    :return: list of string, or joined string if ``sep`` is given, or
+        number of strings written if ``path_or_file`` is given.
+
+    Usage::
+
+        >>> datetime2str_many(datetimes, "%Y-%m-%dT%H:%M:%S")
+        ['2014-01-15T17:58:31', ...]
+        >>> datetime2str_many(datetimes, path_or_file="dates.txt")
+        1000000
+
+    **中文文档**
+
+    批量格式化 datetime。结果可以是列表, 用 ``sep`` 连接的字符串, 或是直接
+    写入文件。连续的相同日期只会格式化一次日期部分。
+    """
+    strings = get_formatter(template).iter_format(datetimes)
+    return _output(strings, sep, path_or_file, encoding, chunksize)
+
+
+def date2str_many(dates, template="%Y-%m-%d", sep=None,
+                  path_or_file=None, encoding="utf-8", chunksize=65536):
+    """
+    Format many dates to string, see :func:`datetime2str_many`.
+
+    :param dates: iterable of date object.
+
+    **中文文档**
+
+    批量格式化 date。
+    """
+    strings = get_formatter(template).iter_format_date(dates)
+    return _output(strings, sep, path_or_file, encoding, chunksize)
@@ -1,82 +1,59 @@
 # -*- coding: utf-8 -*-
 
 import random
+import sys
 from datetime import date, datetime, timedelta
 
-try:  # pragma: no cover
-    import numpy as np
-
-    has_np = True
-except:  # pragma: no cover
-    has_np = False
-
+from .lazy import import_numpy, require_numpy
+from .math import _parse_freq
 from .pkg.sixmini import integer_types, string_types
 from .parse import parser
 from .util import (
     from_utctimestamp, to_utctimestamp,
     from_ordinal, to_ordinal,
+    to_utc,
 )
 
-_valid_freq = [
-    "days", "day", "d",
-    "hours", "hour", "h",
-    "minutes", "minute", "min", "m",
-    "seconds", "second", "sec", "s",
-    "weeks", "week", "w",
-]
+_epoch_ordinal = date(1970, 1, 1).toordinal()
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    has_np = import_numpy() is not None
+
 
+def __getattr__(name):
+    """
+    ``has_np``, kept for backward compatibility, numpy is imported on first
+    access instead of when the module is imported.
+    """
+    if name == "has_np":
+        return import_numpy() is not None
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
-def _freq_parser(freq):  # pragma: no cover
+
+def _freq_parser(freq):
     """
     Parse frequency to timedelta.
 
     Valid keywords "days", "day", "d", "hours", "hour", "h",
     "minutes", "minute", "min", "m", "seconds", "second", "sec", "s",
-    "weeks", "week", "w",
+    "weeks", "week", "w", see :func:`rolex.math._parse_freq`. Negative
+    frequency like "-1d" is allowed.
     """
-    freq = freq.lower().strip()
-
-    error_message = "'%s' is invalid, use one of %s" % (freq, _valid_freq)
-
-    try:
-        # day
-        for surfix in ["days", "day", "d"]:
-            if freq.endswith(surfix):
-                freq = freq.replace(surfix, "")
-                return timedelta(days=int(freq))
-
-        # hour
-        for surfix in ["hours", "hour", "h"]:
-            if freq.endswith(surfix):
-                freq = freq.replace(surfix, "")
-                return timedelta(hours=int(freq))
-
-        # minute
-        for surfix in ["minutes", "minute", "min", "m"]:
-            if freq.endswith(surfix):
-                freq = freq.replace(surfix, "")
-                return timedelta(minutes=int(freq))
-
-        # second
-        for surfix in ["seconds", "second", "sec", "s"]:
-            if freq.endswith(surfix):
-                freq = freq.replace(surfix, "")
-                return timedelta(seconds=int(freq))
-
-        # week
-        for surfix in ["weeks", "week", "w"]:
-            if freq.endswith(surfix):
-                freq = freq.replace(surfix, "")
-                return timedelta(days=int(freq) * 7)
-    except:
-        pass
-
-    raise ValueError(error_message)
+    text = freq.strip()
+    sign = 1
+    if text.startswith("-"):
+        sign, text = -1, text[1:]
+    kind, step, _ = _parse_freq(text)
+    if kind != "us":
+        raise ValueError("'%s' is invalid, calendar frequency is not "
+                         "supported" % freq)
+    return timedelta(microseconds=sign * step)
 
 
 def time_series(start=None, end=None,
                 periods=None, freq="1day",
-                normalize=False, return_date=False):
+                normalize=False, return_date=False,
+                as_numpy=False, dtype="datetime64[us]"):
     """
     A pure Python implementation of pandas.date_range().
 
@@ -105,6 +82,13 @@ def time_series(start=None, end=None,
     :param return_date: Trigger that only return date object.
     :type return_date: boolean (default False)
 
+    :param as_numpy: Trigger that returns a numpy datetime64 array.
+    :type as_numpy: boolean (default False)
+
+    :param dtype: numpy dtype used when ``as_numpy=True``, ``return_date``
+        implies ``datetime64[D]``.
+    :type dtype: string (default 'datetime64[us]')
+
     :return: A list of datetime.datetime object. An evenly sampled time
         series.
 
@@ -154,6 +138,10 @@ def time_series(start=None, end=None,
 
     interval = _freq_parser(freq)
 
+    if as_numpy:
+        return _time_series_np(
+            start, end, periods, interval, normalize, return_date, dtype)
+
     if (bool(start) & bool(end)):  # start and end
         start = parser.parse_datetime(start)
         end = parser.parse_datetime(end)
@@ -190,6 +178,39 @@ def time_series(start=None, end=None,
     return series
 
 
+def _total_microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _time_series_np(start, end, periods, interval,
+                    normalize, return_date, dtype):
+    """
+    numpy version of :func:`time_series`, the whole series is created by
+    one ``arange``.
+    """
+    np = require_numpy()
+    if (bool(start) & bool(end)):  # start and end
+        start = parser.parse_datetime(start)
+        end = parser.parse_datetime(end)
+        _assert_correct_start_end(start, end)
+        periods = _total_microseconds(end - start) \
+            // _total_microseconds(interval) + 1
+    elif (bool(start) & bool(periods)):  # start and periods
+        start = parser.parse_datetime(start)
+    elif (bool(end) & bool(periods)):  # end and periods
+        end = parser.parse_datetime(end)
+        start = end - interval * (periods - 1)
+
+    step = np.timedelta64(_total_microseconds(interval), "us")
+    series = np.datetime64(to_utc(start), "us") + np.arange(periods) * step
+
+    if normalize or return_date:
+        series = series.astype("datetime64[D]")
+    if return_date:
+        return series
+    return series.astype(dtype)
+
+
 def weekday_series(start, end, weekday, return_date=False):
     """Generate a datetime series with same weekday number.
 
@@ -278,10 +299,13 @@ def rnd_date(start=date(1970, 1, 1), end=None, **kwargs):
     return _rnd_date(start, end)
 
 
-def rnd_date_array(size, start=date(1970, 1, 1), end=None, **kwargs):
+def rnd_date_array(size, start=date(1970, 1, 1), end=None,
+                   as_numpy=False, dtype="datetime64[D]", **kwargs):
     """
     Array or Matrix of random date generator.
 
+    :param as_numpy: returns a numpy datetime64 array instead of list.
+    :param dtype: numpy dtype used when ``as_numpy=True``.
     :returns: 1d or 2d array of datetime.date
     """
     if end is None:
@@ -289,6 +313,14 @@ def rnd_date_array(size, start=date(1970, 1, 1), end=None, **kwargs):
     start = parser.parse_date(start)
     end = parser.parse_date(end)
     _assert_correct_start_end(start, end)
+    if as_numpy:
+        np = require_numpy()
+        days = np.random.randint(
+            start.toordinal() - _epoch_ordinal,
+            end.toordinal() - _epoch_ordinal + 1,
+            size=size, dtype=np.int64,
+        )
+        return days.astype("datetime64[D]").astype(dtype)
     return _randn(size, _rnd_date, start, end)
 
 
@@ -307,7 +339,8 @@ def rnd_date_list_high_performance(size, start=date(1970, 1, 1), end=None, **kwa
     start_days = to_ordinal(parser.parse_datetime(start))
     end_days = to_ordinal(parser.parse_datetime(end))
     _assert_correct_start_end(start_days, end_days)
-    if has_np:  # pragma: no cover
+    np = import_numpy()
+    if np is not None:  # pragma: no cover
         return [
             from_ordinal(days)
             for days in np.random.randint(start_days, end_days, size)
@@ -351,10 +384,13 @@ def rnd_datetime(start=datetime(1970, 1, 1), end=datetime.now()):
     return _rnd_datetime(start, end)
 
 
-def rnd_datetime_array(size, start=datetime(1970, 1, 1), end=None):
+def rnd_datetime_array(size, start=datetime(1970, 1, 1), end=None,
+                       as_numpy=False, dtype="datetime64[us]"):
     """
     Array or Matrix of random datetime generator.
 
+    :param as_numpy: returns a numpy datetime64 array instead of list.
+    :param dtype: numpy dtype used when ``as_numpy=True``.
     :returns: 1d or 2d array of datetime.date
     """
     if end is None:
@@ -362,6 +398,14 @@ def rnd_datetime_array(size, start=datetime(1970, 1, 1), end=None):
     start = parser.parse_datetime(start)
     end = parser.parse_datetime(end)
     _assert_correct_start_end(start, end)
+    if as_numpy:
+        np = require_numpy()
+        seconds = np.random.randint(
+            int(to_utctimestamp(start)),
+            int(to_utctimestamp(end)) + 1,
+            size=size, dtype=np.int64,
+        )
+        return seconds.astype("datetime64[s]").astype(dtype)
     return _randn(size, _rnd_datetime, start, end)
 
 
@@ -372,7 +416,8 @@ def rnd_datetime_list_high_performance(size, start=datetime(1970, 1, 1), end=Non
     end_ts = to_utctimestamp(parser.parse_datetime(end))
     _assert_correct_start_end(start, end)
     interval_range = end_ts - start_ts
-    if has_np:  # pragma: no cover
+    np = import_numpy()
+    if np is not None:  # pragma: no cover
         return [
             from_utctimestamp(v * interval_range + start_ts)
             for v in np.random.random(size)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deferred import of heavy dependencies, numpy and :mod:`dateutil.parser` are
+imported on first use, not when ``rolex`` is imported.
+
+**中文文档**
+
+延迟导入较重的依赖, numpy 和 :mod:`dateutil.parser` 在第一次使用时才导入,
+从而缩短 ``import rolex`` 的时间。
+"""
+
+_missing = object()
+_numpy = _missing
+_dateutil_parse = None
+
+
+def import_numpy():
+    """
+    Import numpy on first call.
+
+    :return: numpy module, or None if it's not installed.
+    """
+    global _numpy
+    if _numpy is _missing:
+        try:
+            import numpy as _numpy
+        except ImportError:  # pragma: no cover
+            _numpy = None
+    return _numpy
+
+
+def require_numpy():
+    """
+    Import numpy on first call, raise ImportError if it's not installed.
+    """
+    np = import_numpy()
+    if np is None:  # pragma: no cover
+        raise ImportError("numpy is required for 'as_numpy=True'!")
+    return np
+
+
+def dateutil_parse(timestr, **kwargs):
+    """
+    :func:`dateutil.parser.parse`, imported on first call.
+    """
+    global _dateutil_parse
+    if _dateutil_parse is None:
+        from dateutil.parser import parse as _dateutil_parse
+    return _dateutil_parse(timestr, **kwargs)
@@ -1,11 +1,72 @@
 # -*- coding: utf-8 -*-
 
+import numbers
+import re
 from collections import OrderedDict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from itertools import repeat
+
 try:
+    from .lazy import require_numpy
     from .parse import parser
+    from .pkg import sixmini
 except:  # pragma: no cover
+    from rolex.lazy import require_numpy
     from rolex.parse import parser
+    from rolex.pkg import sixmini
+
+#: month -> number of days in non leap year, index 0 is not used
+_days_in_month = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _shift_month(year, month, day, n):
+    """
+    Shift (year, month, day) by n months, day is clamped to the end of the
+    new month.
+    """
+    year, month = divmod(year * 12 + month - 1 + n, 12)
+    month += 1
+    if day > 28:
+        if month == 2 and _is_leap(year):
+            max_day = 29
+        else:
+            max_day = _days_in_month[month]
+        if day > max_day:
+            day = max_day
+    return year, month, day
+
+
+def _is_datetime64_array(value):
+    return getattr(getattr(value, "dtype", None), "kind", None) == "M"
+
+
+def _is_integer_array(value):
+    return getattr(getattr(value, "dtype", None), "kind", None) in ("i", "u")
+
+
+#: epoch unit -> number of units per second
+_epoch_unit_scale = {"s": 1, "ms": 1000, "us": 1000000, "ns": 1000000000}
+
+_delta_cache = dict()
+_delta_cache_size = 1024
+
+
+def _seconds_delta(n):
+    """
+    timedelta of n seconds, cached, shifting by the same n doesn't allocate
+    a new timedelta for every call.
+    """
+    try:
+        return _delta_cache[n]
+    except KeyError:
+        delta = timedelta(seconds=n)
+        if len(_delta_cache) < _delta_cache_size:
+            _delta_cache[n] = delta
+        return delta
 
 
 # --- Calculator ---
@@ -20,8 +81,11 @@ def add_seconds(datetime_like_object, n, return_date=False):
 
     返回给定日期N秒之后的时间。
     """
-    a_datetime = parser.parse_datetime(datetime_like_object)
-    a_datetime = a_datetime + timedelta(seconds=n)
+    if type(datetime_like_object) is datetime:
+        a_datetime = datetime_like_object
+    else:
+        a_datetime = parser.parse_datetime(datetime_like_object)
+    a_datetime = a_datetime + _seconds_delta(n)
     if return_date:  # pragma: no cover
         return a_datetime.date()
     else:
@@ -86,6 +150,103 @@ def add_weeks(datetime_like_object, n, return_date=False):
     return add_seconds(datetime_like_object, n * 60 * 60 * 24 * 7, return_date)
 
 
+def add_seconds_many(values, n, unit="s"):
+    """
+    Vectorized :func:`add_seconds`, the shift is one integer add.
+
+    :param values: numpy datetime64 array, epoch integers (list or numpy
+        integer array) in ``unit``, or list of datetime like objects.
+    :param n: number of seconds, an number, or a list / array of numbers of
+        the same length.
+    :param unit: unit of epoch integers, "s", "ms", "us" or "ns".
+    :return: the same kind of values as input, numpy array for numpy array,
+        list of integers for list of integers, otherwise list of datetime.
+
+    Usage::
+
+        >>> add_seconds_many([1389808711, 1389808712], 60)
+        [1389808771, 1389808772]
+
+    **中文文档**
+
+    批量地将时间平移 N 秒。对于 epoch 整数或 numpy datetime64 数组, 只需
+    一次整数加法。
+    """
+    try:
+        scale = _epoch_unit_scale[unit]
+    except KeyError:
+        raise ValueError(
+            "'unit' has to be one of %r!" % list(_epoch_unit_scale))
+    if _is_datetime64_array(values):
+        np = require_numpy()
+        n = np.asarray(n)
+        if n.dtype.kind in ("i", "u"):
+            return values + n.astype("timedelta64[s]")
+        microseconds = np.rint(n * 1000000).astype(np.int64)
+        return values + microseconds.astype("timedelta64[us]")
+    if _is_integer_array(values):
+        np = require_numpy()
+        return values + np.rint(np.asarray(n) * scale).astype(values.dtype)
+
+    values = list(values)
+    if values and isinstance(values[0], sixmini.integer_types):
+        if isinstance(n, numbers.Real):
+            if isinstance(n, numbers.Integral):
+                delta = int(n) * scale
+            else:
+                delta = int(round(n * scale))
+            return [value + delta for value in values]
+        return [
+            value + int(round(seconds * scale))
+            for value, seconds in zip(values, n)
+        ]
+
+    datetimes = parser.parse_datetime_many(values)
+    if isinstance(n, numbers.Real):
+        delta = timedelta(seconds=float(n))
+        return [a_datetime + delta for a_datetime in datetimes]
+    return [
+        a_datetime + timedelta(seconds=seconds)
+        for a_datetime, seconds in zip(datetimes, n)
+    ]
+
+
+def _scale_many(n, factor):
+    if isinstance(n, numbers.Real):
+        return n * factor
+    if hasattr(n, "dtype"):
+        return n * factor
+    return [value * factor for value in n]
+
+
+def add_minutes_many(values, n, unit="s"):
+    """
+    Vectorized :func:`add_minutes`, see :func:`add_seconds_many`.
+    """
+    return add_seconds_many(values, _scale_many(n, 60), unit)
+
+
+def add_hours_many(values, n, unit="s"):
+    """
+    Vectorized :func:`add_hours`, see :func:`add_seconds_many`.
+    """
+    return add_seconds_many(values, _scale_many(n, 3600), unit)
+
+
+def add_days_many(values, n, unit="s"):
+    """
+    Vectorized :func:`add_days`, see :func:`add_seconds_many`.
+    """
+    return add_seconds_many(values, _scale_many(n, 86400), unit)
+
+
+def add_weeks_many(values, n, unit="s"):
+    """
+    Vectorized :func:`add_weeks`, see :func:`add_seconds_many`.
+    """
+    return add_seconds_many(values, _scale_many(n, 604800), unit)
+
+
 def add_months(datetime_like_object, n, return_date=False):
     """
     Returns a time that n months after a time.
@@ -103,28 +264,9 @@ def add_months(datetime_like_object, n, return_date=False):
     返回给定日期N月之后的时间。
     """
     a_datetime = parser.parse_datetime(datetime_like_object)
-    month_from_ordinary = a_datetime.year * 12 + a_datetime.month
-    month_from_ordinary += n
-    year, month = divmod(month_from_ordinary, 12)
-
-    # try assign year, month, day
-    try:
-        a_datetime = datetime(
-            year, month, a_datetime.day,
-            a_datetime.hour, a_datetime.minute, a_datetime.second,
-            a_datetime.microsecond, tzinfo=a_datetime.tzinfo,
-        )
-    # 肯定是由于新的月份的日子不够, 所以肯定是月底,
-    # 那么直接跳到下一个月的第一天, 再回退一天
-    except ValueError:
-        month_from_ordinary += 1
-        year, month = divmod(month_from_ordinary, 12)
-        a_datetime = datetime(
-            year, month, 1,
-            a_datetime.hour, a_datetime.minute, a_datetime.second,
-            a_datetime.microsecond, tzinfo=a_datetime.tzinfo,
-        )
-        a_datetime = add_days(a_datetime, -1)
+    year, month, day = _shift_month(
+        a_datetime.year, a_datetime.month, a_datetime.day, n)
+    a_datetime = a_datetime.replace(year=year, month=month, day=day)
 
     if return_date:  # pragma: no cover
         return a_datetime.date()
@@ -144,25 +286,343 @@ def add_years(datetime_like_object, n, return_date=False):
 
     返回给定日期N年之后的时间。
     """
-    a_datetime = parser.parse_datetime(datetime_like_object)
+    return add_months(datetime_like_object, n * 12, return_date)
 
-    # try assign year, month, day
-    try:
-        a_datetime = datetime(
-            a_datetime.year + n, a_datetime.month, a_datetime.day,
-            a_datetime.hour, a_datetime.minute, a_datetime.second,
-            a_datetime.microsecond, tzinfo=a_datetime.tzinfo,
-        )
-    except ValueError:  # Must be xxxx-02-29
-        a_datetime = datetime(
-            a_datetime.year + n, 2, 28,
-            a_datetime.hour, a_datetime.minute,
-            a_datetime.second, a_datetime.microsecond)
 
-    if return_date:  # pragma: no cover
-        return a_datetime.date()
+def _max_day_np(np, index):
+    """
+    Number of days in month, index is months since 1970-01.
+    """
+    year = index // 12 + 1970
+    month = index % 12 + 1
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return np.asarray(_days_in_month, dtype=np.int64)[month] \
+        + (leap & (month == 2))
+
+
+def _add_months_np(array, n):
+    """
+    numpy version of :func:`add_months_many`, integer arithmetic on month
+    index and day of month, the dtype is kept.
+    """
+    np = require_numpy()
+    n = np.asarray(n, dtype=np.int64)
+    days = array.astype("datetime64[D]")
+    months = array.astype("datetime64[M]")
+    time_of_day = array - days.astype(array.dtype)
+    day = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+
+    index = months.astype(np.int64) + n  # months since 1970-01
+    day = np.minimum(day, _max_day_np(np, index))
+
+    result = index.astype("datetime64[M]").astype("datetime64[D]") \
+        + (day - 1).astype("timedelta64[D]")
+    result = result.astype(array.dtype) + time_of_day
+    result[np.isnat(array)] = np.datetime64("NaT")
+    return result
+
+
+def add_months_many(datetime_like_objects, n, return_date=False):
+    """
+    Vectorized :func:`add_months`, shift many datetimes by n months, day is
+    clamped to the end of the month.
+
+    :param datetime_like_objects: list of datetime like objects, or numpy
+        datetime64 array.
+    :param n: number of months, an integer, or a list / array of integers
+        of the same length.
+    :param return_date: returns list of date object instead of datetime,
+        not used by numpy array.
+    :return: list of datetime, or numpy datetime64 array of the same dtype.
+
+    Usage::
+
+        >>> add_months_many(["2012-01-31", "2012-03-31"], [1, -1])
+        [datetime(2012, 2, 29, 0, 0), datetime(2012, 2, 29, 0, 0)]
+
+    **中文文档**
+
+    批量地将日期平移 N 个月, 直接在年月日整数上计算, 并使用预先计算的每月天数
+    表处理月底。支持 numpy datetime64 数组。
+    """
+    if _is_datetime64_array(datetime_like_objects):
+        return _add_months_np(datetime_like_objects, n)
+
+    datetimes = parser.parse_datetime_many(datetime_like_objects)
+    # numbers.Integral also covers numpy integer scalars
+    if isinstance(n, numbers.Integral):
+        n = repeat(int(n))
     else:
-        return a_datetime
+        n = [int(months) for months in n]
+    days_in_month, is_leap = _days_in_month, _is_leap
+    results = list()
+    for a_datetime, months in zip(datetimes, n):
+        year, month = divmod(
+            a_datetime.year * 12 + a_datetime.month - 1 + months, 12)
+        month += 1
+        day = a_datetime.day
+        if day > 28:
+            if month == 2 and is_leap(year):
+                max_day = 29
+            else:
+                max_day = days_in_month[month]
+            if day > max_day:
+                day = max_day
+        results.append(a_datetime.replace(year=year, month=month, day=day))
+    if return_date:
+        return [a_datetime.date() for a_datetime in results]
+    return results
+
+
+def add_years_many(datetime_like_objects, n, return_date=False):
+    """
+    Vectorized :func:`add_years`, see :func:`add_months_many`.
+
+    **中文文档**
+
+    批量地将日期平移 N 年。
+    """
+    if _is_datetime64_array(datetime_like_objects):
+        np = require_numpy()
+        return _add_months_np(
+            datetime_like_objects, np.asarray(n, dtype=np.int64) * 12)
+    if isinstance(n, numbers.Integral):
+        months = n * 12
+    else:
+        months = [years * 12 for years in n]
+    return add_months_many(datetime_like_objects, months, return_date)
+
+
+#: microseconds of one day
+_day_microseconds = 86400000000
+
+
+def _time_of_day(dt):
+    return ((dt.hour * 60 + dt.minute) * 60 + dt.second) * 1000000 \
+        + dt.microsecond
+
+
+def _truncate(value, size):
+    """
+    Number of whole ``size`` in value, truncated toward zero.
+    """
+    if value >= 0:
+        return value // size
+    return -(-value // size)
+
+
+def _diff_months(start, end):
+    """
+    Whole months from start to end, computed on the fields.
+
+    The result m is the largest (in absolute value) number that
+    ``add_months(start, m)`` doesn't pass end, the day of start is clamped
+    to the end of the month of end, the same as :func:`add_months`.
+    """
+    months = (end.year - start.year) * 12 + end.month - start.month
+    if months == 0:
+        return 0
+    day = start.day
+    if day > 28:
+        if end.month == 2 and _is_leap(end.year):
+            max_day = 29
+        else:
+            max_day = _days_in_month[end.month]
+        if day > max_day:
+            day = max_day
+    if day == end.day:
+        start_key, end_key = _time_of_day(start), _time_of_day(end)
+    else:
+        start_key, end_key = day, end.day
+    if months > 0:
+        if start_key > end_key:
+            months -= 1
+    elif start_key < end_key:
+        months += 1
+    return months
+
+
+def _diff_microseconds(start, end):
+    return (end.toordinal() - start.toordinal()) * _day_microseconds \
+        + _time_of_day(end) - _time_of_day(start)
+
+
+def _diff(start, end, kind):
+    if kind == "months":
+        return _diff_months(start, end)
+    elif kind == "years":
+        return _truncate(_diff_months(start, end), 12)
+    elif kind == "days":
+        return _truncate(_diff_microseconds(start, end), _day_microseconds)
+    else:
+        return _truncate(_diff_microseconds(start, end),
+                         7 * _day_microseconds)
+
+
+def diff_days(start, end):
+    """
+    Number of whole days from start to end, truncated toward zero,
+    negative if end is before start.
+
+    :param start: a datetime object or a datetime str.
+    :param end: a datetime object or a datetime str.
+
+    **中文文档**
+
+    计算两个时间之间相差的整天数。
+    """
+    return _diff(parser.parse_datetime(start), parser.parse_datetime(end),
+                 "days")
+
+
+def diff_weeks(start, end):
+    """
+    Number of whole weeks from start to end, see :func:`diff_days`.
+
+    **中文文档**
+
+    计算两个时间之间相差的整周数。
+    """
+    return _diff(parser.parse_datetime(start), parser.parse_datetime(end),
+                 "weeks")
+
+
+def diff_months(start, end):
+    """
+    Number of whole months from start to end, the inverse of
+    :func:`add_months`, truncated toward zero.
+
+    The result m is the largest number of months that ``add_months(start,
+    m)`` doesn't pass end, with the same month end clamping. For example
+    2015-01-31 to 2015-02-28 is one month.
+
+    :param start: a datetime object or a datetime str.
+    :param end: a datetime object or a datetime str.
+
+    **中文文档**
+
+    计算两个时间之间相差的整月数, 是 :func:`add_months` 的逆运算。月底的处理
+    与 :func:`add_months` 一致。
+    """
+    return _diff(parser.parse_datetime(start), parser.parse_datetime(end),
+                 "months")
+
+
+def diff_years(start, end):
+    """
+    Number of whole years from start to end, the inverse of
+    :func:`add_years`, see :func:`diff_months`.
+
+    **中文文档**
+
+    计算两个时间之间相差的整年数, 可用于计算年龄, 工龄。
+    """
+    return _diff(parser.parse_datetime(start), parser.parse_datetime(end),
+                 "years")
+
+
+def _as_datetime64(np, values):
+    if _is_datetime64_array(values):
+        return values
+    if isinstance(values, (sixmini.string_types, date)):
+        return np.datetime64(parser.parse_datetime(values), "us")
+    return np.array(parser.parse_datetime_many(values),
+                    dtype="datetime64[us]")
+
+
+def _diff_np(starts, ends, kind):
+    np = require_numpy()
+    starts, ends = _as_datetime64(np, starts), _as_datetime64(np, ends)
+    # at least day precision, so time of day is an integer
+    dtype = np.promote_types(
+        np.promote_types(starts.dtype, ends.dtype), "datetime64[D]")
+    starts, ends = starts.astype(dtype), ends.astype(dtype)
+    if np.isnat(starts).any() or np.isnat(ends).any():
+        raise ValueError("NaT is not allowed!")
+    day = np.timedelta64(1, "D").astype(
+        dtype.str.replace("M8", "m8")).astype(np.int64)
+
+    if kind in ("days", "weeks"):
+        delta = (ends - starts).astype(np.int64)
+        size = day if kind == "days" else day * 7
+        return np.sign(delta) * (np.abs(delta) // size)
+
+    def fields(array):
+        months = array.astype("datetime64[M]")
+        days = array.astype("datetime64[D]")
+        day_of_month = (days - months.astype("datetime64[D]")) \
+            .astype(np.int64) + 1
+        time_of_day = (array - days.astype(dtype)).astype(np.int64)
+        return months.astype(np.int64), day_of_month, time_of_day
+
+    start_index, start_day, start_time = fields(starts)
+    end_index, end_day, end_time = fields(ends)
+    start_day = np.minimum(start_day, _max_day_np(np, end_index))
+    start_key = start_day * day + start_time
+    end_key = end_day * day + end_time
+    months = end_index - start_index
+    months = months - ((months > 0) & (start_key > end_key)) \
+        + ((months < 0) & (start_key < end_key))
+    if kind == "years":
+        return np.sign(months) * (np.abs(months) // 12)
+    return months
+
+
+def _diff_many(starts, ends, kind):
+    if _is_datetime64_array(starts) or _is_datetime64_array(ends):
+        return _diff_np(starts, ends, kind)
+    starts = parser.parse_datetime_many(starts)
+    if isinstance(ends, (sixmini.string_types, date)):
+        ends = repeat(parser.parse_datetime(ends))
+    else:
+        ends = parser.parse_datetime_many(ends)
+    return [_diff(start, end, kind) for start, end in zip(starts, ends)]
+
+
+def diff_days_many(starts, ends):
+    """
+    Vectorized :func:`diff_days`, computed from integer fields, no
+    datetime or timedelta is created per item.
+
+    :param starts: list of datetime like objects, or numpy datetime64
+        array.
+    :param ends: list of datetime like objects, or numpy datetime64 array,
+        or one datetime like object for all starts.
+    :return: list of integer, or numpy integer array for numpy array, NaT
+        is not allowed.
+
+    Usage::
+
+        >>> diff_days_many(["2015-01-31", "2015-02-27 12:00"], "2015-02-28")
+        [28, 0]
+
+    **中文文档**
+
+    批量计算两个时间之间相差的整天数。直接在年月日等整数上计算, 支持 numpy
+    datetime64 数组。
+    """
+    return _diff_many(starts, ends, "days")
+
+
+def diff_weeks_many(starts, ends):
+    """
+    Vectorized :func:`diff_weeks`, see :func:`diff_days_many`.
+    """
+    return _diff_many(starts, ends, "weeks")
+
+
+def diff_months_many(starts, ends):
+    """
+    Vectorized :func:`diff_months`, see :func:`diff_days_many`.
+    """
+    return _diff_many(starts, ends, "months")
+
+
+def diff_years_many(starts, ends):
+    """
+    Vectorized :func:`diff_years`, see :func:`diff_days_many`.
+    """
+    return _diff_many(starts, ends, "years")
 
 
 def _floor_to(dt, hour, minute, second):
@@ -242,3 +702,303 @@ def round_to(dt, hour, minute, second, mode="round"):
         raise ValueError(
             "'mode' has to be one of %r!" % list(_round_to_options.keys()))
     return _round_to_options[mode](dt, hour, minute, second)
+
+
+# --- Frequency bucketing ---
+_epoch = datetime(1970, 1, 1)
+_epoch_ordinal = _epoch.toordinal()
+
+#: frequency keyword -> ("us", microseconds) or ("month", months)
+_freq_units = dict()
+for _keywords, _unit in [
+    (["days", "day", "d"], ("us", 86400000000)),
+    (["hours", "hour", "h"], ("us", 3600000000)),
+    (["minutes", "minute", "min", "m"], ("us", 60000000)),
+    (["seconds", "second", "sec", "s"], ("us", 1000000)),
+    (["weeks", "week", "w"], ("us", 604800000000)),
+    (["months", "month", "mon"], ("month", 1)),
+    (["years", "year", "y"], ("month", 12)),
+]:
+    for _keyword in _keywords:
+        _freq_units[_keyword] = _unit
+
+_freq_pattern = re.compile(r"\s*(\d*)\s*([a-z]+)\s*\Z")
+
+#: week buckets start on Monday, 1970-01-05
+_week_anchor = 4 * 86400000000
+
+_freq_cache = dict()
+_freq_cache_size = 1024
+
+
+def _parse_freq(freq):
+    """
+    Parse frequency string, for example ``"15min"``, ``"1h"``, ``"1week"``
+    or ``"1month"``.
+
+    :return: ("us", step in microseconds, anchor in microseconds) or
+        ("month", step in months, 0).
+    """
+    try:
+        return _freq_cache[freq]
+    except KeyError:
+        pass
+    m = _freq_pattern.match(freq.lower())
+    if m is None or m.group(2) not in _freq_units:
+        raise ValueError(
+            "'%s' is invalid, use one of %s" % (freq, sorted(_freq_units)))
+    count = int(m.group(1) or 1)
+    if count <= 0:
+        raise ValueError("'%s' is invalid, frequency has to be positive"
+                         % freq)
+    kind, size = _freq_units[m.group(2)]
+    anchor = _week_anchor if (kind, size) == ("us", 604800000000) else 0
+    result = (kind, count * size, anchor)
+    if len(_freq_cache) < _freq_cache_size:
+        _freq_cache[freq] = result
+    return result
+
+
+def _to_microseconds(dt):
+    """
+    Microseconds since 1970-01-01 of the wall clock time of a datetime.
+    """
+    return (dt.toordinal() - _epoch_ordinal) * 86400000000 \
+        + (dt.hour * 3600 + dt.minute * 60 + dt.second) * 1000000 \
+        + dt.microsecond
+
+
+def _bucket_microseconds(value, step, anchor, mode):
+    """
+    Floor, ceil or round an integer to the grid ``anchor + k * step``.
+    Ties are rounded down, same as :func:`round_to`.
+    """
+    floor = value - (value - anchor) % step
+    if floor == value or mode == "floor":
+        return floor
+    if mode == "ceil" or (value - floor) * 2 > step:
+        return floor + step
+    return floor
+
+
+def _bucket_month(dt, step, mode):
+    index = (dt.year - 1970) * 12 + dt.month - 1
+    floor_index = index - index % step
+    year, month = divmod(floor_index, 12)
+    floor = dt.replace(year=year + 1970, month=month + 1, day=1,
+                       hour=0, minute=0, second=0, microsecond=0)
+    if floor == dt or mode == "floor":
+        return floor
+    year, month = divmod(floor_index + step, 12)
+    ceil = floor.replace(year=year + 1970, month=month + 1)
+    if mode == "ceil" or (dt - floor) > (ceil - dt):
+        return ceil
+    return floor
+
+
+def _bucket(dt, freq, mode):
+    kind, step, anchor = _parse_freq(freq)
+    if kind == "month":
+        return _bucket_month(dt, step, mode)
+    value = _to_microseconds(dt)
+    delta = _bucket_microseconds(value, step, anchor, mode) - value
+    if delta:
+        return dt + timedelta(microseconds=delta)
+    return dt
+
+
+def floor_to_freq(datetime_like_object, freq):
+    """
+    Round a time down to the frequency grid.
+
+    The grid starts at 1970-01-01 00:00:00, weeks start on Monday, months
+    and years start on the first day of the month. Timezone awared datetime
+    is rounded on its wall clock time.
+
+    :param datetime_like_object: a datetime object or a datetime str.
+    :param freq: frequency string, for example "15min", "1h", "1day",
+        "1week", "1month", "1year", same keywords as :func:`rolex.time_series`.
+
+    Usage::
+
+        >>> floor_to_freq(datetime(2014, 1, 15, 17, 58, 31), "15min")
+        datetime.datetime(2014, 1, 15, 17, 45)
+
+    **中文文档**
+
+    将时间向下对齐到频率网格上, 例如 5 分钟, 1 小时, 1 个月。
+    """
+    if type(datetime_like_object) is datetime:
+        a_datetime = datetime_like_object
+    else:
+        a_datetime = parser.parse_datetime(datetime_like_object)
+    return _bucket(a_datetime, freq, "floor")
+
+
+def ceil_to_freq(datetime_like_object, freq):
+    """
+    Round a time up to the frequency grid, see :func:`floor_to_freq`.
+
+    **中文文档**
+
+    将时间向上对齐到频率网格上。
+    """
+    if type(datetime_like_object) is datetime:
+        a_datetime = datetime_like_object
+    else:
+        a_datetime = parser.parse_datetime(datetime_like_object)
+    return _bucket(a_datetime, freq, "ceil")
+
+
+def round_to_freq(datetime_like_object, freq):
+    """
+    Round a time to the nearest point of the frequency grid, ties are
+    rounded down, see :func:`floor_to_freq`.
+
+    **中文文档**
+
+    将时间对齐到最近的频率网格点上。
+    """
+    if type(datetime_like_object) is datetime:
+        a_datetime = datetime_like_object
+    else:
+        a_datetime = parser.parse_datetime(datetime_like_object)
+    return _bucket(a_datetime, freq, "round")
+
+
+#: numpy datetime64 unit -> microseconds
+_np_unit_microseconds = {
+    "D": 86400000000, "h": 3600000000, "m": 60000000, "s": 1000000,
+    "ms": 1000, "us": 1,
+}
+
+
+def _bucket_integers(np, values, step, anchor, mode):
+    """
+    Integer division bucketing of a numpy integer array.
+    """
+    floor = values - (values - anchor) % step
+    if mode == "floor":
+        return floor
+    remainder = values - floor
+    if mode == "ceil":
+        up = remainder > 0
+    else:
+        up = remainder * 2 > step
+    return floor + np.where(up, step, 0)
+
+
+def _bucket_np(array, freq, mode):
+    np = require_numpy()
+    kind, step, anchor = _parse_freq(freq)
+    nat = np.isnat(array)
+    if kind == "month":
+        months = array.astype("datetime64[M]")
+        index = months.astype(np.int64)
+        floor_index = index - index % step
+        floor = floor_index.astype("datetime64[M]").astype(array.dtype)
+        if mode == "floor":
+            result = floor
+        else:
+            ceil = (floor_index + step).astype("datetime64[M]") \
+                .astype(array.dtype)
+            if mode == "ceil":
+                up = array > floor
+            else:
+                up = (array - floor) > (ceil - array)
+            result = np.where(up, ceil, floor)
+    else:
+        unit, count = np.datetime_data(array.dtype)
+        if unit == "ns":
+            scale = 1000 * count
+            step, anchor = step * 1000 // count, anchor * 1000 // count
+        else:
+            scale = _np_unit_microseconds.get(unit, 0) * count
+            if not scale or step % scale or anchor % scale:
+                array = array.astype("datetime64[us]")
+                scale = 1
+            step, anchor = step // scale, anchor // scale
+        values = array.view(np.int64)
+        result = _bucket_integers(np, values, step, anchor, mode) \
+            .view(array.dtype)
+    result[nat] = np.datetime64("NaT")
+    return result
+
+
+def _bucket_many(values, freq, mode, unit):
+    try:
+        scale = _epoch_unit_scale[unit]
+    except KeyError:
+        raise ValueError(
+            "'unit' has to be one of %r!" % list(_epoch_unit_scale))
+    if _is_datetime64_array(values):
+        return _bucket_np(values, freq, mode)
+
+    kind, step, anchor = _parse_freq(freq)
+    integer_array = _is_integer_array(values)
+    if not integer_array:
+        values = list(values)
+    is_epoch = integer_array or (
+        len(values) > 0 and isinstance(values[0], sixmini.integer_types))
+
+    if is_epoch and kind == "us" and (step * scale) % 1000000 == 0:
+        step, anchor = step * scale // 1000000, anchor * scale // 1000000
+        if integer_array:
+            return _bucket_integers(require_numpy(), values, step, anchor,
+                                    mode)
+        return [
+            _bucket_microseconds(value, step, anchor, mode)
+            for value in values
+        ]
+
+    if is_epoch:
+        results = [
+            _to_microseconds(_bucket(
+                _epoch + timedelta(microseconds=value * 1000000 // scale),
+                freq, mode,
+            )) * scale // 1000000
+            for value in (values.tolist() if integer_array else values)
+        ]
+        if integer_array:
+            return require_numpy().array(results, dtype=values.dtype)
+        return results
+    return [
+        _bucket(a_datetime, freq, mode)
+        for a_datetime in parser.parse_datetime_many(values)
+    ]
+
+
+def floor_to_freq_many(values, freq, unit="s"):
+    """
+    Vectorized :func:`floor_to_freq`, bucketing is an integer division.
+
+    :param values: numpy datetime64 array, epoch integers (list or numpy
+        integer array) in ``unit``, or list of datetime like objects.
+    :param freq: frequency string, see :func:`floor_to_freq`.
+    :param unit: unit of epoch integers, "s", "ms", "us" or "ns".
+    :return: the same kind of values as input.
+
+    Usage::
+
+        >>> floor_to_freq_many([1389808711, 1389808771], "5min")
+        [1389808500, 1389808500]
+
+    **中文文档**
+
+    批量地将时间向下对齐到频率网格上, 对 epoch 整数或 numpy 数组只需整数除法。
+    """
+    return _bucket_many(values, freq, "floor", unit)
+
+
+def ceil_to_freq_many(values, freq, unit="s"):
+    """
+    Vectorized :func:`ceil_to_freq`, see :func:`floor_to_freq_many`.
+    """
+    return _bucket_many(values, freq, "ceil", unit)
+
+
+def round_to_freq_many(values, freq, unit="s"):
+    """
+    Vectorized :func:`round_to_freq`, see :func:`floor_to_freq_many`.
+    """
+    return _bucket_many(values, freq, "round", unit)
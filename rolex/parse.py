@@ -1,16 +1,34 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from datetime import date, datetime
-
-from dateutil.parser import parse
+import csv
+import io
+import mmap
+import re
+from array import array
+from itertools import repeat
+from datetime import date, datetime, timedelta
 
 try:
+    from .cache import Cache
+    from .lazy import dateutil_parse, require_numpy
     from .pkg import sixmini
-    from .util import from_ordinal, from_utctimestamp
+    from .stats import EPOCH, ISO8601, ParserStats, _timer
+    from .template import Template, TemplateRegistry, signature
+    from .tz import fixed_offset, utc
+    from .util import (
+        from_ordinal, from_utctimestamp, to_utc, to_utctimestamp,
+    )
 except:  # pragma: no cover
+    from rolex.cache import Cache
+    from rolex.lazy import dateutil_parse, require_numpy
     from rolex.pkg import sixmini
-    from rolex.util import from_ordinal, from_utctimestamp
+    from rolex.stats import EPOCH, ISO8601, ParserStats, _timer
+    from rolex.template import Template, TemplateRegistry, signature
+    from rolex.tz import fixed_offset, utc
+    from rolex.util import (
+        from_ordinal, from_utctimestamp, to_utc, to_utctimestamp,
+    )
 
 
 date_template_and_example = [
@@ -39,6 +57,12 @@ date_template_and_example = [
     ("%m%d%y", "092014"),
 ]
 date_template_list = [tpl for tpl, example in date_template_and_example]
+"""
+Built-in date templates, the default of ``Parser(date_templates=...)``.
+The list is read once when a :class:`Parser` is created, appending to it
+doesn't change existing parsers, including :data:`parser`. Use
+``parser.date_templates.add(template, example)`` instead.
+"""
 
 datetime_template_and_example = [
     # Dash delimiter
@@ -116,14 +140,671 @@ if sixmini.PY3:  # pragma: no cover
 datetime_template_and_example.extend(date_template_and_example)
 datetime_template_list = [tpl for tpl,
                           example in datetime_template_and_example]
+"""
+Built-in datetime templates, the default of
+``Parser(datetime_templates=...)``. Like :data:`date_template_list`, use
+``parser.datetime_templates.add(template, example)`` to add a template.
+"""
+
+compiled_templates = dict(
+    (tpl, Template(tpl, example))
+    for tpl, example in datetime_template_and_example
+)
+"""
+template -> :class:`~rolex.template.Template` mapping.
+"""
+_compiled_date_template_list = [
+    compiled_templates[tpl] for tpl in date_template_list]
+_compiled_datetime_template_list = [
+    compiled_templates[tpl] for tpl in datetime_template_list]
+
+
+_zero_delta = timedelta(0)
+
+
+def _parse_iso8601_offset(text):
+    """
+    Parse ISO 8601 utc offset, ``Z``, ``+HH:MM``, ``+HHMM`` or ``+HH``.
+    tzinfo objects are interned, see :func:`rolex.tz.fixed_offset`.
+
+    :return: tzinfo object, or None if it's not a valid utc offset.
+    """
+    if text == "Z" or text == "z":
+        return fixed_offset(_zero_delta)
+    sign = text[0]
+    if sign != "+" and sign != "-":
+        return None
+    length = len(text)
+    if length == 6 and text[3] == ":":
+        hh, mm = text[1:3], text[4:6]
+    elif length == 5:
+        hh, mm = text[1:3], text[3:5]
+    elif length == 3:
+        hh, mm = text[1:3], "00"
+    else:
+        return None
+    if not (hh + mm).isdigit():
+        return None
+    hours, minutes = int(hh), int(mm)
+    if hours > 23 or minutes > 59:
+        return None
+    delta = timedelta(hours=hours, minutes=minutes)
+    if sign == "-":
+        delta = -delta
+    return fixed_offset(delta)
+
+
+def parse_iso8601(text, aware=True):
+    """
+    Hand tuned ISO 8601 / RFC 3339 parser, using fixed offset slicing.
+
+    Supported format is ``YYYY-MM-DD[(T| )HH:MM[:SS[.f]]][Z|+HH:MM]``,
+    fractional seconds can have any length (truncated to microseconds),
+    utc offset can be ``Z``, ``+HH:MM``, ``+HHMM`` or ``+HH``.
+
+    :param text: a string.
+    :param aware: if False, datetime with utc offset is converted to naive
+        utc datetime.
+    :return: a datetime object, or None if it's not an ISO 8601 string.
+
+    **中文文档**
+
+    专门为 ISO 8601 / RFC 3339 格式优化的解析函数, 直接按固定位置切片。
+    如果不是 ISO 8601 格式, 返回 None。
+    """
+    length = len(text)
+    if length < 10 or text[4] != "-" or text[7] != "-":
+        return None
+    yyyy, mm, dd = text[0:4], text[5:7], text[8:10]
+    if not (yyyy + mm + dd).isdigit():
+        return None
+    hour = minute = second = microsecond = 0
+    tzinfo = None
+
+    if length > 10:
+        if text[10] not in "Tt " or length < 16 or text[13] != ":":
+            return None
+        hh, mi = text[11:13], text[14:16]
+        if not (hh + mi).isdigit():
+            return None
+        hour, minute = int(hh), int(mi)
+        i = 16
+        if length > 16 and text[16] == ":":
+            ss = text[17:19]
+            if len(ss) != 2 or not ss.isdigit():
+                return None
+            second = int(ss)
+            i = 19
+            if length > 19 and (text[19] == "." or text[19] == ","):
+                i = 20
+                while i < length and text[i].isdigit():
+                    i += 1
+                fraction = text[20:i]
+                if not fraction:
+                    return None
+                microsecond = int(fraction[:6].ljust(6, "0"))
+        if i < length:
+            tzinfo = _parse_iso8601_offset(text[i:])
+            if tzinfo is None:
+                return None
+
+    try:
+        a_datetime = datetime(
+            int(yyyy), int(mm), int(dd),
+            hour, minute, second, microsecond, tzinfo,
+        )
+    except ValueError:
+        return None
+    if tzinfo is not None and not aware:
+        return to_utc(a_datetime)
+    return a_datetime
+
+
+def _fromiter(iterable, dtype):
+    """
+    Build numpy datetime64 array from iterable of date / datetime, without
+    creating the intermediate list.
+    """
+    np = require_numpy()
+    return np.fromiter(_to_naive_utc(iterable), dtype=dtype)
+
+
+def _astimezone_utc(a_datetime):
+    """
+    Convert timezone awared datetime to utc, with tzinfo
+    :data:`rolex.tz.utc`. Naive datetime is returned as it is.
+    """
+    tzinfo = a_datetime.tzinfo
+    if tzinfo is None or tzinfo is utc:
+        return a_datetime
+    return a_datetime.astimezone(utc)
+
+
+def _to_naive_utc(iterable):
+    """
+    numpy datetime64 doesn't have timezone, convert awared datetime to
+    naive utc datetime.
+    """
+    for value in iterable:
+        if getattr(value, "tzinfo", None) is not None:
+            yield to_utc(value)
+        else:
+            yield value
+
+
+_valid_errors = ["raise", "coerce", "ignore"]
+
+_has_digit = re.compile(r"\d").search
+
+
+def _check_errors(errors):
+    if errors not in _valid_errors:
+        raise ValueError("'errors' has to be one of %r!" % _valid_errors)
+
+
+def _collect(inputs, results, errors, as_numpy, dtype):
+    """
+    Collect the results of error tolerant bulk parse, None means failure.
+
+    :return: (values, failure mask)
+    """
+    mask = bytearray(result is None for result in results)
+    if as_numpy:
+        return _fromiter(results, dtype), \
+            require_numpy().frombuffer(bytes(mask), dtype=bool)
+    if errors == "ignore" and any(mask):
+        results = [
+            value if failed else result
+            for value, result, failed in zip(inputs, results, mask)
+        ]
+    return results, mask
+
+
+_buffer_types = (sixmini.binary_type, bytearray, memoryview, mmap.mmap)
+
+#: exact types of :meth:`Parser.parse_datetime_many` groups
+_exact_string_types = tuple(set([str, sixmini.text_type]))
+_exact_integer_types = sixmini.integer_types
+_exact_buffer_types = tuple(set(_buffer_types) - set(_exact_string_types))
+
+
+def _decode_buffer(buffer, offset, endpos, encoding="utf-8",
+                   errors="strict"):
+    """
+    Decode a slice of bytes like object to string.
+    """
+    return sixmini.text_type(
+        memoryview(buffer)[offset:endpos], encoding, errors)
+
+
+_epoch = datetime(1970, 1, 1)
+
+_epoch_pattern = re.compile(r"([+-]?)(\d+)(?:\.(\d*))?\Z")
+
+_valid_epoch_unit = ["s", "ms", "us", "ns"]
+
+
+def guess_epoch_unit(value):
+    """
+    Guess the unit of an epoch number by its magnitude.
+
+    - less than 1e11: seconds, up to year 5138
+    - less than 1e14: milliseconds
+    - less than 1e17: microseconds
+    - otherwise: nanoseconds
+
+    :return: "s", "ms", "us" or "ns".
+    """
+    value = abs(value)
+    if value < 10 ** 11:
+        return "s"
+    elif value < 10 ** 14:
+        return "ms"
+    elif value < 10 ** 17:
+        return "us"
+    else:
+        return "ns"
+
+
+def parse_epoch(value, unit=None):
+    """
+    Parse epoch number or numeric epoch string, e.g. ``1389808711123``,
+    ``"1389808711"`` or ``"-1.5"``, to naive utc datetime. Conversion is
+    done by integer arithmetic, no float precision lost.
+
+    :param value: integer or string.
+    :param unit: "s", "ms", "us" or "ns", by default it's guessed by
+        :func:`guess_epoch_unit`.
+    :return: a datetime object. None if value is not a numeric string or
+        it's out of range.
+
+    **中文文档**
+
+    解析整数或数字字符串形式的 epoch 时间戳, 单位 (秒, 毫秒, 微秒, 纳秒) 可以
+    显式指定, 也可以根据数值大小自动判断。
+    """
+    if isinstance(value, sixmini.integer_types):
+        negative = value < 0
+        integer, fraction = abs(value), ""
+    else:
+        m = _epoch_pattern.match(value)
+        if m is None:
+            return None
+        sign, integer, fraction = m.groups()
+        negative = sign == "-"
+        integer, fraction = int(integer), fraction or ""
+
+    if unit is None:
+        unit = guess_epoch_unit(integer)
+    if unit == "s":
+        microseconds = integer * 1000000 + int(fraction[:6].ljust(6, "0"))
+    elif unit == "ms":
+        microseconds = integer * 1000 + int(fraction[:3].ljust(3, "0"))
+    elif unit == "us":
+        microseconds = integer
+    elif unit == "ns":
+        microseconds = integer // 1000
+    else:
+        raise ValueError("'unit' has to be one of %r!" % _valid_epoch_unit)
+    if negative:
+        microseconds = -microseconds
+
+    try:
+        return _epoch + timedelta(microseconds=microseconds)
+    except OverflowError:
+        if isinstance(value, sixmini.integer_types):
+            raise
+        return None
+
+
+def _epoch_ints(values, unit=None):
+    """
+    Batch version of :func:`parse_epoch` for integers, with the unit lookup
+    and the locals hoisted out of the loop.
+    """
+    if unit is not None and unit not in _valid_epoch_unit:
+        raise ValueError("'unit' has to be one of %r!" % _valid_epoch_unit)
+    epoch, delta, guess = _epoch, timedelta, guess_epoch_unit
+    results = list()
+    for value in values:
+        value_unit = unit or guess(value)
+        if value_unit == "s":
+            microseconds = value * 1000000
+        elif value_unit == "ms":
+            microseconds = value * 1000
+        elif value_unit == "us":
+            microseconds = value
+        elif value < 0:
+            microseconds = -(-value // 1000)
+        else:
+            microseconds = value // 1000
+        results.append(epoch + delta(microseconds=microseconds))
+    return results
+
+
+#: epoch seconds range of datetime, [0001-01-01, 10000-01-01)
+_min_timestamp = float((datetime.min - _epoch).days * 86400)
+_max_timestamp = float((datetime.max - _epoch).days * 86400 + 86400)
+
+
+def _try_from_utctimestamp(value):
+    """
+    :func:`~rolex.util.from_utctimestamp`, returns None for nan, inf and
+    out of range float.
+    """
+    if _min_timestamp <= value < _max_timestamp:
+        try:
+            return from_utctimestamp(value)
+        except OverflowError:  # rounded up to 10000-01-01
+            return None
+    return None
+
+
+def _is_epoch_first(text):
+    """
+    Decide if a numeric string should be parsed as epoch before trying
+    the templates, by the digits before the decimal point. 8 digits or less
+    is a compact date like ``20140920``. 10, 12, 14 digits starts with 19 or
+    20 is a compact datetime like ``2014011506``. Others are epoch, like
+    ``1389808711123``.
+    """
+    digits, _, fraction = text.partition(".")
+    if not digits.isdigit() or (fraction and not fraction.isdigit()):
+        return False
+    length = len(digits)
+    if length <= 8:
+        return False
+    if length in (10, 12, 14) and digits[:2] in ("19", "20"):
+        return False
+    return True
+
+
+#: template made of numeric directives only, e.g. ``"%Y%m%d%H%M"``, could
+#: match an epoch string
+_numeric_template_pattern = re.compile(r"(?:%[YymdHIMSf]|\.)+\Z")
+
+_numeric_templates = dict()
+
+
+def _is_numeric_template(template):
+    """
+    If the compiled template could match a numeric epoch string.
+    """
+    try:
+        return _numeric_templates[template.template]
+    except KeyError:
+        result = template.template is not None and \
+            _numeric_template_pattern.match(template.template) is not None
+        _numeric_templates[template.template] = result
+        return result
+
+
+def _epoch_override(text, unit):
+    """
+    A numeric template matched the text, returns the epoch datetime if the
+    text should be parsed as epoch first, the same rule as
+    :meth:`Parser.str2datetime`. Otherwise None.
+    """
+    if unit is not None or _is_epoch_first(text):
+        return parse_epoch(text, unit)
+    return None
+
+
+def _to_epoch_microseconds(a_datetime):
+    """
+    Number of microseconds from UTC 1970-01-01 00:00:00, naive datetime is
+    considered as utc time. Integer arithmetic, no float precision lost.
+    """
+    if a_datetime.tzinfo is not None:
+        a_datetime = to_utc(a_datetime)
+    delta = a_datetime - _epoch
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+#: parser of the worker process, created on its first chunk
+_worker_parser = None
+_worker_parser_kwargs = None
+
+
+def _parse_chunk(datetime_str_list, template, parser_kwargs):
+    """
+    Worker of :meth:`Parser.parse_many`, parse a chunk of strings to epoch
+    microseconds array, which is much smaller than a pickled datetime list.
+
+    The parser is created once per worker process and reused by the later
+    chunks, templates are not recompiled for every chunk.
+    """
+    global _worker_parser, _worker_parser_kwargs
+    if _worker_parser is None or _worker_parser_kwargs != parser_kwargs:
+        _worker_parser = Parser(**parser_kwargs)
+        _worker_parser_kwargs = parser_kwargs
+    datetimes = _worker_parser._iter_str2datetime(datetime_str_list, template)
+    return array("q", [_to_epoch_microseconds(dt) for dt in datetimes])
+
+
+class _NoTemplate(object):
+    """
+    Default template of an empty template registry, it never matches.
+    """
+    template = None
+
+    def match(self, text):
+        return None
+
+    def match_buffer(self, buffer, pos=0, endpos=None):
+        return None
+
+
+_no_template = _NoTemplate()
 
 
 class Parser(object):
     """
     datetime string parser.
+
+    :param iso_aware: if False, ISO 8601 string with utc offset is parsed
+        as naive utc datetime, see :func:`parse_iso8601`.
+    :param cache_size: if greater than zero, enable a bounded
+        :class:`~rolex.cache.Cache` of parsed strings, repeated strings
+        are not parsed again. Disabled by default.
+    :param cache_policy: cache eviction policy, "lru" or "fifo".
+    :param fallback_threshold: number of consecutive strings no template
+        matches, before parser switches to :meth:`dateutil.parser.parse`
+        directly.
+    :param fallback_reprobe: number of :meth:`dateutil.parser.parse`
+        successes before parser tries the templates again.
+    :param epoch_unit: unit of epoch numbers and numeric strings, "s",
+        "ms", "us" or "ns". By default it's guessed by the magnitude, see
+        :func:`parse_epoch`. If it's given, numeric strings are always
+        parsed as epoch.
+    :param date_templates: iterable of template string,
+        ``(template, example)`` tuple or :class:`~rolex.template.Template`,
+        used by :meth:`Parser.str2date`. Default is
+        :data:`date_template_and_example`.
+    :param datetime_templates: same as ``date_templates``, used by
+        :meth:`Parser.str2datetime`. Default is
+        :data:`datetime_template_and_example`.
+    :param locales: extra locales of month and day names, for example
+        ``["de"]``, see :func:`rolex.template.add_locale`. English names are
+        always understood, regardless of ``LC_TIME``.
+    :param normalize_utc: if True, timezone awared datetime is converted to
+        utc, with tzinfo :data:`rolex.tz.utc`, in the same pass as parsing.
+        Naive datetime is not changed.
+    :param collect_stats: if True, collect template hit counts, fallback
+        counts and latency, see :meth:`Parser.stats`. Disabled by default.
+
+    ISO 8601 / RFC 3339 strings are recognized by :func:`parse_iso8601`
+    first, they never reach the template machinery.
+
+    Besides the remembered default template, parser keeps a signature index,
+    :func:`~rolex.template.signature` of the string -> templates that could
+    match it. So when the format changes in the stream, only a few
+    candidate templates are tried instead of a full rescan.
+    """
+    signature_index_size = 4096
+    """
+    Max number of signatures to remember, index is cleared when it's full.
     """
-    _default_date_template = date_template_list[0]
-    _default_datetime_template = datetime_template_list[0]
+
+    def __init__(self, iso_aware=True, cache_size=0, cache_policy="lru",
+                 fallback_threshold=10, fallback_reprobe=100,
+                 epoch_unit=None, date_templates=None, datetime_templates=None,
+                 locales=None, normalize_utc=False, collect_stats=False):
+        self.iso_aware = iso_aware
+        self.locales = tuple(locales or ())
+        self.normalize_utc = normalize_utc
+        self.epoch_unit = epoch_unit
+        self.fallback_threshold = fallback_threshold
+        self.fallback_reprobe = fallback_reprobe
+        self._circuit_open = False
+        self._fallback_count = 0
+        self._date_signature_index = dict()
+        self._datetime_signature_index = dict()
+
+        if date_templates is None:
+            date_templates = _compiled_date_template_list
+        if datetime_templates is None:
+            datetime_templates = _compiled_datetime_template_list
+        if self.locales:
+            date_templates = self._with_locales(date_templates)
+            datetime_templates = self._with_locales(datetime_templates)
+        self.date_templates = TemplateRegistry(
+            date_templates, on_change=self._on_date_templates_change,
+            locales=self.locales)
+        """
+        :class:`~rolex.template.TemplateRegistry` of this parser, used by
+        :meth:`Parser.str2date`.
+        """
+        self.datetime_templates = TemplateRegistry(
+            datetime_templates, on_change=self._on_datetime_templates_change,
+            locales=self.locales)
+        """
+        :class:`~rolex.template.TemplateRegistry` of this parser, used by
+        :meth:`Parser.str2datetime`.
+        """
+        self._default_date = self._first_template(self.date_templates)
+        self._default_datetime = self._first_template(
+            self.datetime_templates)
+        if cache_size:
+            self.date_cache = Cache(cache_size, cache_policy)
+            self.datetime_cache = Cache(cache_size, cache_policy)
+        else:
+            self.date_cache = None
+            self.datetime_cache = None
+        if collect_stats:
+            self._date_stats = ParserStats()
+            self._datetime_stats = ParserStats()
+            self.str2date = self._timed_str2date
+            self.str2datetime = self._timed_str2datetime
+        else:
+            self._date_stats = None
+            self._datetime_stats = None
+        if normalize_utc:
+            self._parse_datetime_str = self._utc_parse_datetime_str
+
+    @staticmethod
+    def _with_locales(templates):
+        """
+        Compiled templates are compiled again with the parser locales.
+        """
+        return [
+            (template.template, template.example)
+            if isinstance(template, Template) else template
+            for template in templates
+        ]
+
+    @staticmethod
+    def _first_template(registry):
+        if len(registry):
+            return registry.compiled[0]
+        return _no_template
+
+    def _on_date_templates_change(self):
+        self._date_signature_index.clear()
+        if self._default_date.template not in self.date_templates:
+            self._default_date = self._first_template(self.date_templates)
+
+    def _on_datetime_templates_change(self):
+        self._datetime_signature_index.clear()
+        if self._default_datetime.template not in self.datetime_templates:
+            self._default_datetime = self._first_template(
+                self.datetime_templates)
+
+    @property
+    def _default_date_template(self):
+        """
+        The remembered default date template.
+        """
+        return self._default_date.template
+
+    @property
+    def _default_datetime_template(self):
+        """
+        The remembered default datetime template.
+        """
+        return self._default_datetime.template
+
+    def _parser_kwargs(self):
+        """
+        Arguments to create a parser with the same settings, used by
+        worker processes.
+        """
+        return dict(
+            iso_aware=self.iso_aware,
+            epoch_unit=self.epoch_unit,
+            locales=self.locales,
+            normalize_utc=self.normalize_utc,
+            date_templates=[
+                (template.template, template.example)
+                for template in self.date_templates
+            ],
+            datetime_templates=[
+                (template.template, template.example)
+                for template in self.datetime_templates
+            ],
+        )
+
+    def stats(self):
+        """
+        Returns parser statistics, None if ``collect_stats`` is not enabled.
+
+        Strings parsed by the bulk API, e.g. :meth:`Parser.str2datetime_many`,
+        are counted in ``calls`` and ``template_hits``. Only strings parsed
+        one by one are timed, ``latency_histogram`` doesn't include the
+        bulk template hits. Buffer APIs are not counted.
+
+        :return: dict, {"date": ..., "datetime": ...}, see
+            :meth:`~rolex.stats.ParserStats.to_dict`.
+        """
+        if self._date_stats is None:
+            return None
+        return {
+            "date": self._date_stats.to_dict(),
+            "datetime": self._datetime_stats.to_dict(),
+        }
+
+    def reset_stats(self):
+        """
+        Reset parser statistics to zero.
+        """
+        if self._date_stats is not None:
+            self._date_stats.reset()
+            self._datetime_stats.reset()
+
+    def _timed_str2date(self, date_str):
+        start = _timer()
+        try:
+            return Parser.str2date(self, date_str)
+        finally:
+            self._date_stats.record_latency(_timer() - start)
+
+    def _timed_str2datetime(self, datetime_str):
+        start = _timer()
+        try:
+            return self._str2datetime(datetime_str)
+        finally:
+            self._datetime_stats.record_latency(_timer() - start)
+
+    def cache_info(self):
+        """
+        Returns statistics of the parsed strings cache, None if cache is
+        not enabled.
+
+        :return: dict, {"date": ..., "datetime": ...}
+        """
+        if self.date_cache is None:
+            return None
+        return {
+            "date": self.date_cache.info(),
+            "datetime": self.datetime_cache.info(),
+        }
+
+    def clear_cache(self):
+        """
+        Remove all cached parsed strings.
+        """
+        if self.date_cache is not None:
+            self.date_cache.clear()
+            self.datetime_cache.clear()
+
+    def _candidates(self, text, index, template_list, stats=None):
+        """
+        Find the templates that could match the string, by its signature.
+        """
+        text_signature = signature(text)
+        try:
+            return index[text_signature]
+        except KeyError:
+            if stats is not None:
+                stats.rescans += 1
+            if len(index) >= self.signature_index_size:
+                index.clear()
+            candidates = [
+                template for template in template_list
+                if template.could_match(text_signature)
+            ]
+            index[text_signature] = candidates
+            return candidates
 
     # --- Parse datetime ---
     def str2date(self, date_str):
@@ -134,7 +815,8 @@ class Parser(object):
         https://github.com/MacHu-GWU/rolex-project/issues
         submit your datetime string. I 'll update templates ASAP.
 
-        This method is faster than :meth:`dateutil.parser.parse`.
+        This method is faster than :meth:`dateutil.parser.parse`. Templates
+        are precompiled, see :class:`~rolex.template.Template`.
 
         :param date_str: a string represent a date
         :type date_str: str
@@ -147,25 +829,69 @@ class Parser(object):
         字符串非常多, 且模式单一时, 只有第一次尝试耗时较多, 之后就非常快了。
         该方法要快过 :meth:`dateutil.parser.parse` 方法。
         """
+        cache = self.date_cache
+        if cache is None:
+            return self._parse_date_str(date_str)
+        a_date = cache.get(date_str)
+        if a_date is None:
+            a_date = self._parse_date_str(date_str)
+            cache.put(date_str, a_date)
+        return a_date
+
+    def _parse_date_str(self, date_str):
+        a_date = self._match_date_str(date_str)
+        if a_date is None:
+            raise ValueError("Unable to parse date from: %r!" % date_str)
+        return a_date
+
+    def _try_str2date(self, date_str):
+        """
+        Same as :meth:`Parser.str2date`, but returns None instead of raising
+        an exception, used by error tolerant bulk parse.
+        """
+        if not isinstance(date_str, sixmini.string_types):
+            return None
+        cache = self.date_cache
+        if cache is None:
+            return self._match_date_str(date_str)
+        a_date = cache.get(date_str)
+        if a_date is None:
+            a_date = self._match_date_str(date_str)
+            if a_date is not None:
+                cache.put(date_str, a_date)
+        return a_date
+
+    def _match_date_str(self, date_str):
+        """
+        The template engine of :meth:`Parser.str2date`.
+
+        :return: a date object, or None if no template matches.
+        """
+        stats = self._date_stats
+
         # try default date template
-        try:
-            a_datetime = datetime.strptime(
-                date_str, self._default_date_template)
+        a_datetime = self._default_date.match(date_str)
+        if a_datetime is not None:
+            if stats is not None:
+                stats.hit(self._default_date_template)
             return a_datetime.date()
-        except:
-            pass
 
-        # try every date templates
-        for template in date_template_list:
-            try:
-                a_datetime = datetime.strptime(date_str, template)
-                self._default_date_template = template
+        # try candidate date templates
+        if stats is not None:
+            stats.default_misses += 1
+        for template in self._candidates(
+                date_str,
+                self._date_signature_index,
+                self.date_templates.compiled,
+                stats):
+            a_datetime = template.match(date_str)
+            if a_datetime is not None:
+                self._default_date = template
+                if stats is not None:
+                    stats.hit(template.template)
                 return a_datetime.date()
-            except:
-                pass
 
-        # raise error
-        raise ValueError("Unable to parse date from: %r!" % date_str)
+        return None
 
     def _str2datetime(self, datetime_str):
         """
@@ -175,7 +901,8 @@ class Parser(object):
         https://github.com/MacHu-GWU/rolex-project/issues
         submit your datetime string. I 'll update templates ASAP.
 
-        This method is faster than :meth:`dateutil.parser.parse`.
+        This method is faster than :meth:`dateutil.parser.parse`. Templates
+        are precompiled, see :class:`~rolex.template.Template`.
 
         :param datetime_str: a string represent a datetime
         :type datetime_str: str
@@ -188,40 +915,842 @@ class Parser(object):
         字符串非常多, 且模式单一时, 只有第一次尝试耗时较多, 之后就非常快了。
         该方法要快过 :meth:`dateutil.parser.parse` 方法。
 
-        为了防止模板库失败的情况, 程序设定在失败后自动一直启用
-        :meth:`dateutil.parser.parse` 进行解析。你可以调用 :meth:`Parser.reset()`
+        为了防止模板库失败的情况, 无法被模板解析的字符串会交给
+        :meth:`dateutil.parser.parse` 进行解析。连续失败 ``fallback_threshold``
+        次后, 会直接使用 :meth:`dateutil.parser.parse`, 并在其成功解析
+        ``fallback_reprobe`` 次后重新尝试模板。你可以调用 :meth:`Parser.reset()`
         方法恢复默认设定。
         """
-        # try default datetime template
+        cache = self.datetime_cache
+        if cache is None:
+            return self._parse_datetime_str(datetime_str)
+        a_datetime = cache.get(datetime_str)
+        if a_datetime is None:
+            a_datetime = self._parse_datetime_str(datetime_str)
+            cache.put(datetime_str, a_datetime)
+        return a_datetime
+
+    def _parse_datetime_str(self, datetime_str):
+        """
+        Parse datetime from string, use :meth:`dateutil.parser.parse` as
+        a per string fallback, with a circuit breaker.
+
+        - closed: try template engine first, after ``fallback_threshold``
+          consecutive fallbacks, the circuit opens.
+        - open: ISO 8601 and epoch strings are still recognized, others
+          use dateutil directly. After ``fallback_reprobe`` dateutil
+          successes, re-probe the template engine once, close the circuit
+          if it matches.
+        """
+        if self._circuit_open:
+            # the circuit only bypasses the template scan
+            a_datetime = self._match_fast_path(datetime_str)
+            if a_datetime is not None:
+                return a_datetime
+            if self._fallback_count < self.fallback_reprobe:
+                a_datetime = dateutil_parse(datetime_str)
+                self._fallback_count += 1
+                if self._datetime_stats is not None:
+                    self._datetime_stats.fallbacks += 1
+                return a_datetime
+
+            # re-probe template engine
+            a_datetime = self._match_datetime_str(datetime_str)
+            if a_datetime is not None:
+                self._circuit_open = False
+                self._fallback_count = 0
+                return a_datetime
+            self._fallback_count = 0
+            if self._datetime_stats is not None:
+                self._datetime_stats.fallbacks += 1
+            return dateutil_parse(datetime_str)
+
+        a_datetime = self._match_datetime_str(datetime_str)
+        if a_datetime is not None:
+            if self._fallback_count:
+                self._fallback_count = 0
+            return a_datetime
+
+        a_datetime = dateutil_parse(datetime_str)
+        if self._datetime_stats is not None:
+            self._datetime_stats.fallbacks += 1
+        self._fallback_count += 1
+        if self._fallback_count >= self.fallback_threshold:
+            self._circuit_open = True
+            self._fallback_count = 0
+        return a_datetime
+
+    def _try_str2datetime(self, datetime_str):
+        """
+        Same as :meth:`Parser.str2datetime`, but template engine only,
+        returns None if no template matches, used by error tolerant bulk
+        parse. No exception is raised and caught per string.
+        """
+        if not isinstance(datetime_str, sixmini.string_types):
+            return None
+        cache = self.datetime_cache
+        if cache is not None:
+            a_datetime = cache.get(datetime_str)
+            if a_datetime is not None:
+                return a_datetime
+        a_datetime = self._match_datetime_str(datetime_str)
+        if a_datetime is not None:
+            if self.normalize_utc:
+                a_datetime = _astimezone_utc(a_datetime)
+            if cache is not None:
+                cache.put(datetime_str, a_datetime)
+        return a_datetime
+
+    def _try_str2datetime_fallback(self, datetime_str):
+        """
+        Same as :meth:`Parser._try_str2datetime`, but strings no template
+        matches are parsed by :meth:`dateutil.parser.parse`. String without
+        any digit is rejected before dateutil.
+        """
+        if not isinstance(datetime_str, sixmini.string_types) \
+                or _has_digit(datetime_str) is None:
+            return None
         try:
-            a_datetime = datetime.strptime(
-                datetime_str, self._default_datetime_template)
+            return self.str2datetime(datetime_str)
+        except (ValueError, OverflowError):
+            return None
+
+    def _utc_parse_datetime_str(self, datetime_str):
+        return _astimezone_utc(Parser._parse_datetime_str(self, datetime_str))
+
+    def _match_fast_path(self, datetime_str):
+        """
+        ISO 8601 and epoch recognizers, tried before the templates, and
+        before dateutil when the fallback circuit is open.
+
+        :return: a datetime object, or None.
+        """
+        stats = self._datetime_stats
+
+        # try iso 8601
+        a_datetime = parse_iso8601(datetime_str, self.iso_aware)
+        if a_datetime is not None:
+            if stats is not None:
+                stats.hit(ISO8601)
             return a_datetime
-        except:
-            pass
 
-        # try every datetime templates
-        for template in datetime_template_list:
-            try:
-                a_datetime = datetime.strptime(datetime_str, template)
-                self._default_datetime_template = template
+        # try epoch
+        if self.epoch_unit is not None or (
+                (datetime_str.isdigit() or "." in datetime_str) and
+                _is_epoch_first(datetime_str)):
+            a_datetime = parse_epoch(datetime_str, self.epoch_unit)
+            if a_datetime is not None:
+                if stats is not None:
+                    stats.hit(EPOCH)
                 return a_datetime
-            except:
-                pass
+        return None
 
-        # raise error
-        a_datetime = parse(datetime_str)
-        self.str2datetime = parse
+    def _match_datetime_str(self, datetime_str):
+        """
+        The template engine of :meth:`Parser.str2datetime`.
 
-        return a_datetime
+        :return: a datetime object, or None if no template matches.
+        """
+        a_datetime = self._match_fast_path(datetime_str)
+        if a_datetime is not None:
+            return a_datetime
+        stats = self._datetime_stats
+
+        # try default datetime template
+        a_datetime = self._default_datetime.match(datetime_str)
+        if a_datetime is not None:
+            if stats is not None:
+                stats.hit(self._default_datetime_template)
+            return a_datetime
+
+        # try candidate datetime templates
+        if stats is not None:
+            stats.default_misses += 1
+        for template in self._candidates(
+                datetime_str,
+                self._datetime_signature_index,
+                self.datetime_templates.compiled,
+                stats):
+            a_datetime = template.match(datetime_str)
+            if a_datetime is not None:
+                self._default_datetime = template
+                if stats is not None:
+                    stats.hit(template.template)
+                return a_datetime
+
+        # try epoch, e.g. "1389808711.123", "-1389808711"
+        a_datetime = parse_epoch(datetime_str)
+        if a_datetime is not None:
+            if stats is not None:
+                stats.hit(EPOCH)
+            return a_datetime
+
+        return None
 
     str2datetime = _str2datetime
 
+    def _get_template(self, template):
+        """
+        Get the compiled :class:`~rolex.template.Template` of a template.
+        """
+        if isinstance(template, Template):
+            return template
+        compiled = self.datetime_templates.get(template) \
+            or self.date_templates.get(template)
+        if compiled is None and not self.locales:
+            compiled = compiled_templates.get(template)
+        if compiled is None:
+            compiled = Template(template, locales=self.locales)
+        return compiled
+
+    def infer_format(self, samples):
+        """
+        Learn the datetime template from a sample of strings.
+
+        Every template is scored by the number of samples it matches. The
+        template matches most samples wins, ties are broken by the order
+        in :attr:`Parser.datetime_templates`. For example, ``"01-02-2014"``
+        could be matched by many templates, but ``"01-13-2014"`` in the same
+        sample votes for the month first one.
+
+        The winner can be passed to the bulk parse API, e.g.
+        ``parser.str2datetime_many(data, template=template)``.
+
+        :param samples: iterable of datetime strings.
+        :return: (template, confidence), confidence is the ratio of samples
+            matched by the template. ``(None, 0.0)`` if nothing matches.
+
+        **中文文档**
+
+        从样本中推断日期时间模板。对每个模板计算其能匹配的样本数量, 匹配最多的
+        模板胜出, 票数相同时以模板列表中的顺序为准。返回模板以及匹配样本的比例。
+        """
+        votes = dict()
+        n_samples = 0
+        for sample in samples:
+            n_samples += 1
+            for template in self._candidates(
+                    sample,
+                    self._datetime_signature_index,
+                    self.datetime_templates.compiled):
+                if template.match(sample) is not None:
+                    votes[template.template] = \
+                        votes.get(template.template, 0) + 1
+
+        if not votes:
+            return None, 0.0
+
+        priority = dict(
+            (tpl, i) for i, tpl in enumerate(self.datetime_templates.templates))
+        template = min(
+            votes, key=lambda tpl: (-votes[tpl], priority.get(tpl, 0)))
+        return template, float(votes[template]) / n_samples
+
+    # --- Bulk parse ---
+    def _iter_str2date(self, date_str_list, template=None, str2date=None):
+        """
+        Generator version of :meth:`Parser.str2date_many`.
+
+        :param str2date: function to parse the strings the template doesn't
+            match, default :meth:`Parser.str2date`.
+        """
+        match = None
+        if template is not None:
+            compiled = self._get_template(template)
+            match, template_name = compiled.match, compiled.template
+        # template hits in this loop are counted here, str2date counts
+        # its own calls unless it's the error tolerant one
+        stats = self._date_stats
+        count_miss = stats is not None and str2date is not None
+        if str2date is None:
+            str2date = self.str2date
+
+        for date_str in date_str_list:
+            if match is not None:
+                a_datetime = match(date_str)
+                if a_datetime is not None:
+                    if stats is not None:
+                        stats.calls += 1
+                        stats.hit(template_name)
+                    yield a_datetime.date()
+                    continue
+            if count_miss:
+                stats.calls += 1
+            yield str2date(date_str)
+            match = self._default_date.match
+            template_name = self._default_date.template
+
+    def _iter_str2datetime(self, datetime_str_list, template=None,
+                           str2datetime=None):
+        """
+        Generator version of :meth:`Parser.str2datetime_many`.
+
+        :param str2datetime: function to parse the strings the template
+            doesn't match, default :meth:`Parser.str2datetime`.
+        """
+        match = None
+        numeric = False
+        if template is not None:
+            compiled = self._get_template(template)
+            match, numeric = compiled.match, _is_numeric_template(compiled)
+            template_name = compiled.template
+        # template hits in this loop are counted here, str2datetime counts
+        # its own calls unless it's the error tolerant one
+        stats = self._datetime_stats
+        count_miss = stats is not None and str2datetime is not None
+        if str2datetime is None:
+            str2datetime = self.str2datetime
+        normalize_utc = self.normalize_utc
+        epoch_unit = self.epoch_unit
+
+        for datetime_str in datetime_str_list:
+            if match is not None:
+                a_datetime = match(datetime_str)
+                if a_datetime is not None:
+                    name = template_name
+                    if numeric:
+                        epoch_datetime = _epoch_override(
+                            datetime_str, epoch_unit)
+                        if epoch_datetime is not None:
+                            a_datetime, name = epoch_datetime, EPOCH
+                    if stats is not None:
+                        stats.calls += 1
+                        stats.hit(name)
+                    if normalize_utc:
+                        a_datetime = _astimezone_utc(a_datetime)
+                    yield a_datetime
+                    continue
+            if count_miss:
+                stats.calls += 1
+            yield str2datetime(datetime_str)
+            match = self._default_datetime.match
+            numeric = _is_numeric_template(self._default_datetime)
+            template_name = self._default_datetime.template
+
+    @staticmethod
+    def _strings_only(values):
+        """
+        Replace non string values, e.g. None, with empty string, which no
+        template matches.
+        """
+        string_types = sixmini.string_types
+        return [
+            value if isinstance(value, string_types) else ""
+            for value in values
+        ]
+
+    def str2date_many(self, date_str_list, template=None,
+                      as_numpy=False, dtype="datetime64[D]", errors="raise"):
+        """
+        Parse many date strings.
+
+        The template is learned from the first string (or given by
+        ``template``), and then applied to all strings in a tight loop. Only
+        the strings it doesn't match are parsed by :meth:`Parser.str2date`,
+        which may switch to a new template.
+
+        :param date_str_list: iterable of date strings.
+        :param template: optional, the known template of the strings.
+        :param as_numpy: returns a numpy datetime64 array instead of list.
+        :param dtype: numpy dtype used when ``as_numpy=True``.
+        :param errors: "raise" (default), raise an exception on the first
+            string that can't be parsed. "coerce", the value is None (NaT
+            in numpy array). "ignore", the value is the input itself (NaT
+            in numpy array).
+        :return: list of date object. If ``errors`` is "coerce" or "ignore",
+            returns (values, failure mask), mask is a ``bytearray`` (numpy
+            bool array if ``as_numpy=True``), 1 means the string can't be
+            parsed.
+
+        **中文文档**
+
+        批量解析date。只用第一个字符串 (或是 ``template`` 参数) 确定模板, 然后
+        对所有字符串直接使用该模板, 只有失败的时候才逐个调用
+        :meth:`Parser.str2date`。``errors="coerce"`` 或 ``"ignore"`` 时,
+        无法解析的字符串不会抛出异常, 而是在失败掩码中标记出来。
+        """
+        _check_errors(errors)
+        if errors != "raise":
+            inputs = list(date_str_list)
+            results = list(self._iter_str2date(
+                self._strings_only(inputs), template, self._try_str2date))
+            return _collect(inputs, results, errors, as_numpy, dtype)
+
+        results = self._iter_str2date(date_str_list, template)
+        if as_numpy:
+            return _fromiter(results, dtype)
+        return list(results)
+
+    def str2datetime_many(self, datetime_str_list, template=None,
+                          as_numpy=False, dtype="datetime64[us]",
+                          errors="raise", fallback=False):
+        """
+        Parse many datetime strings.
+
+        The template is learned from the first string (or given by
+        ``template``), and then applied to all strings in a tight loop. Only
+        the strings it doesn't match are parsed by :meth:`Parser.str2datetime`,
+        which may switch to a new template.
+
+        :param datetime_str_list: iterable of datetime strings.
+        :param template: optional, the known template of the strings.
+        :param as_numpy: returns a numpy datetime64 array instead of list,
+            timezone awared datetime is stored as utc time.
+        :param dtype: numpy dtype used when ``as_numpy=True``.
+        :param errors: "raise" (default), raise an exception on the first
+            string that can't be parsed. "coerce", the value is None (NaT
+            in numpy array). "ignore", the value is the input itself (NaT
+            in numpy array).
+        :param fallback: used with ``errors="coerce"`` or ``"ignore"``,
+            strings no template matches are parsed by
+            :meth:`dateutil.parser.parse`. By default they are failures,
+            there's no exception raised per failed string.
+        :return: list of datetime object. If ``errors`` is "coerce" or
+            "ignore", returns (values, failure mask), see
+            :meth:`Parser.str2date_many`.
+
+        Usage::
+
+            >>> values, mask = parser.str2datetime_many(
+            ...     ["2014-01-15 17:58:31", "N/A"], errors="coerce")
+            >>> values
+            [datetime.datetime(2014, 1, 15, 17, 58, 31), None]
+            >>> list(mask)
+            [0, 1]
+
+        **中文文档**
+
+        批量解析datetime。只用第一个字符串 (或是 ``template`` 参数) 确定模板,
+        然后对所有字符串直接使用该模板, 只有失败的时候才逐个调用
+        :meth:`Parser.str2datetime`。``as_numpy=True`` 时返回连续内存的
+        numpy datetime64 数组, 比 datetime 列表节省大量内存。
+        """
+        _check_errors(errors)
+        if errors != "raise":
+            inputs = list(datetime_str_list)
+            if fallback:
+                try_str2datetime = self._try_str2datetime_fallback
+            else:
+                try_str2datetime = self._try_str2datetime
+            results = list(self._iter_str2datetime(
+                self._strings_only(inputs), template, try_str2datetime))
+            return _collect(inputs, results, errors, as_numpy, dtype)
+
+        results = self._iter_str2datetime(datetime_str_list, template)
+        if as_numpy:
+            return _fromiter(results, dtype)
+        return list(results)
+
+    def parse_many(self, datetime_str_list, template=None,
+                   workers=None, chunksize=65536,
+                   epoch=False, as_numpy=False):
+        """
+        Parse many datetime strings, in parallel with a process pool if
+        ``workers`` is greater than 1.
+
+        The template is inferred once from a sample (or given by
+        ``template``) and passed to every worker, so workers skip inference.
+        Each worker sends back a compact epoch microseconds array, results
+        are in the same order as the input.
+
+        :param datetime_str_list: iterable of datetime strings.
+        :param template: optional, the known template of the strings.
+        :param workers: number of worker processes, None or 1 means parse
+            in current process.
+        :param chunksize: number of strings per task.
+        :param epoch: returns ``array("q")`` of epoch microseconds.
+        :param as_numpy: returns numpy ``datetime64[us]`` array.
+        :return: list of naive utc datetime by default. Timezone awared
+            datetime is converted to utc.
+
+        **中文文档**
+
+        批量解析datetime, ``workers`` 大于 1 时使用多进程并行解析。模板只在
+        主进程中推断一次, 然后传给所有子进程。子进程返回紧凑的 epoch 微秒数组,
+        而不是 pickle 之后的 datetime 列表。结果顺序与输入一致。
+        """
+        if workers is None or workers <= 1:
+            values = array("q", [
+                _to_epoch_microseconds(a_datetime)
+                for a_datetime in self._iter_str2datetime(
+                    datetime_str_list, template)
+            ])
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            datetime_str_list = list(datetime_str_list)
+            if template is None:
+                template, _ = self.infer_format(datetime_str_list[:100])
+            else:
+                # compiled template can't be pickled, send the string
+                template = self._get_template(template).template
+            chunks = [
+                datetime_str_list[i:i + chunksize]
+                for i in range(0, len(datetime_str_list), chunksize)
+            ]
+            values = array("q")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk_values in executor.map(
+                        _parse_chunk, chunks,
+                        repeat(template), repeat(self._parser_kwargs())):
+                    values.extend(chunk_values)
+
+        if epoch:
+            return values
+        if as_numpy:
+            np = require_numpy()
+            return np.frombuffer(values, dtype=np.int64) \
+                .view("datetime64[us]")
+        return [_epoch + timedelta(microseconds=value) for value in values]
+
+    # --- Parse from buffer ---
+    def buffer2date(self, buffer, offset=0, length=None):
+        """
+        Parse date from a bytes like object, ``bytes``, ``bytearray``,
+        ``memoryview`` or ``mmap``, or a slice of it.
+
+        The default template is matched against the buffer directly, there's
+        no intermediate string. Only if it misses, the slice is decoded
+        and parsed by the template engine, which may switch to a new template.
+
+        :param buffer: bytes like object.
+        :param offset: start offset of the slice.
+        :param length: length of the slice, default to the end of buffer.
+        :return: a date object
+
+        **中文文档**
+
+        直接从 bytes, bytearray, memoryview, mmap 等对象 (或其中的一段) 解析
+        date, 默认模板命中时无需先解码为字符串。
+        """
+        endpos = None if length is None else offset + length
+        a_datetime = self._default_date.match_buffer(buffer, offset, endpos)
+        if a_datetime is not None:
+            return a_datetime.date()
+        return self.str2date(_decode_buffer(buffer, offset, endpos))
+
+    def buffer2datetime(self, buffer, offset=0, length=None):
+        """
+        Parse datetime from a bytes like object, ``bytes``, ``bytearray``,
+        ``memoryview`` or ``mmap``, or a slice of it.
+
+        The default template is matched against the buffer directly, there's
+        no intermediate string. Only if it misses, the slice is decoded
+        and parsed by the template engine, which may switch to a new template.
+
+        :param buffer: bytes like object.
+        :param offset: start offset of the slice.
+        :param length: length of the slice, default to the end of buffer.
+        :return: a datetime object
+
+        **中文文档**
+
+        直接从 bytes, bytearray, memoryview, mmap 等对象 (或其中的一段) 解析
+        datetime, 默认模板命中时无需先解码为字符串。
+        """
+        endpos = None if length is None else offset + length
+        a_datetime = self._default_datetime \
+            .match_buffer(buffer, offset, endpos)
+        if a_datetime is not None:
+            if _is_numeric_template(self._default_datetime):
+                a_datetime = _epoch_override(
+                    _decode_buffer(buffer, offset, endpos),
+                    self.epoch_unit) or a_datetime
+            if self.normalize_utc:
+                a_datetime = _astimezone_utc(a_datetime)
+            return a_datetime
+
+        datetime_str = _decode_buffer(buffer, offset, endpos)
+        if self.epoch_unit is not None or _is_epoch_first(datetime_str):
+            return self.str2datetime(datetime_str)
+
+        # prefer a template, so next buffer can be matched directly
+        for template in self._candidates(
+                datetime_str,
+                self._datetime_signature_index,
+                self.datetime_templates.compiled):
+            a_datetime = template.match(datetime_str)
+            if a_datetime is not None:
+                self._default_datetime = template
+                if self.normalize_utc:
+                    a_datetime = _astimezone_utc(a_datetime)
+                return a_datetime
+        return self.str2datetime(datetime_str)
+
+    def _try_buffer2datetime(self, buffer, try_str2datetime):
+        """
+        Same as :meth:`Parser.buffer2datetime`, but returns None instead of
+        raising an exception, used by error tolerant bulk parse. If the
+        default template misses, the buffer is decoded and parsed by
+        ``try_str2datetime``.
+        """
+        a_datetime = self._default_datetime.match_buffer(buffer)
+        if a_datetime is not None:
+            if _is_numeric_template(self._default_datetime):
+                a_datetime = _epoch_override(
+                    _decode_buffer(buffer, 0, None),
+                    self.epoch_unit) or a_datetime
+            if self.normalize_utc:
+                a_datetime = _astimezone_utc(a_datetime)
+            return a_datetime
+        return try_str2datetime(
+            _decode_buffer(buffer, 0, None, errors="replace"))
+
+    def _iter_buffer2datetime(self, buffer, offsets, lengths, template=None):
+        """
+        Generator version of :meth:`Parser.buffer2datetime_many`.
+        """
+        if isinstance(lengths, sixmini.integer_types):
+            lengths = repeat(lengths)
+        if template is None:
+            compiled = self._default_datetime
+        else:
+            compiled = self._get_template(template)
+        match_buffer = compiled.match_buffer
+        numeric = _is_numeric_template(compiled)
+        normalize_utc = self.normalize_utc
+        epoch_unit = self.epoch_unit
+
+        for offset, length in zip(offsets, lengths):
+            a_datetime = match_buffer(buffer, offset, offset + length)
+            if a_datetime is not None:
+                if numeric:
+                    a_datetime = _epoch_override(
+                        _decode_buffer(buffer, offset, offset + length),
+                        epoch_unit) or a_datetime
+                if normalize_utc:
+                    a_datetime = _astimezone_utc(a_datetime)
+            else:
+                a_datetime = self.buffer2datetime(buffer, offset, length)
+                match_buffer = self._default_datetime.match_buffer
+                numeric = _is_numeric_template(self._default_datetime)
+            yield a_datetime
+
+    def buffer2datetime_many(self, buffer, offsets, lengths, template=None,
+                             as_numpy=False, dtype="datetime64[us]"):
+        """
+        Parse many datetimes from one bytes like object, by their offsets.
+
+        :param buffer: bytes like object, ``bytes``, ``bytearray``,
+            ``memoryview`` or ``mmap``.
+        :param offsets: iterable of start offset of each datetime.
+        :param lengths: iterable of length of each datetime, or an integer
+            for fixed width records.
+        :param template: optional, the known template of the datetimes.
+        :param as_numpy: returns a numpy datetime64 array instead of list.
+        :param dtype: numpy dtype used when ``as_numpy=True``.
+        :return: list of datetime object.
+
+        **中文文档**
+
+        根据偏移量, 从同一个 buffer 中批量解析 datetime。
+        """
+        results = self._iter_buffer2datetime(
+            buffer, offsets, lengths, template)
+        if as_numpy:
+            return _fromiter(results, dtype)
+        return list(results)
+
+    # --- Streaming parse ---
+    @staticmethod
+    def _iter_fields(f, column=None, pattern=None, delimiter=","):
+        """
+        Extract timestamp string from each line of a file object.
+        """
+        if column is not None:
+            for row in csv.reader(f, delimiter=delimiter):
+                if len(row) > column:
+                    yield row[column].strip()
+        elif pattern is not None:
+            if isinstance(pattern, sixmini.string_types):
+                pattern = re.compile(pattern)
+            search = pattern.search
+            for line in f:
+                m = search(line)
+                if m is not None:
+                    yield m.group(1) if pattern.groups else m.group(0)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+
+    def iter_file(self, path_or_file, column=None, pattern=None,
+                  delimiter=",", skip_header=False, template=None,
+                  epoch=False, encoding="utf-8"):
+        """
+        Lazily parse timestamps from a text or csv file, line by line, with
+        constant memory. The template is learned once and reused across
+        the whole stream, see :meth:`Parser.str2datetime_many`.
+
+        :param path_or_file: file path, or a text file object.
+        :param column: csv column index of the timestamp.
+        :param pattern: regex (str or compiled) to extract the timestamp
+            from each line, use the first group if it has one. Lines don't
+            match are skipped.
+        :param delimiter: csv delimiter, used with ``column``.
+        :param skip_header: skip the first line.
+        :param template: optional, the known template of the timestamps.
+        :param epoch: yield epoch seconds (int) instead of datetime.
+        :param encoding: file encoding, used with file path.
+
+        If neither ``column`` nor ``pattern`` is given, the whole line is
+        the timestamp, blank lines are skipped.
+
+        Usage::
+
+            >>> for dt in parser.iter_file("events.csv", column=2,
+            ...                            skip_header=True):
+            ...     ...
+
+        **中文文档**
+
+        以流的方式逐行读取文本或 csv 文件, 按列序号或正则表达式提取时间字符串并
+        解析, 内存占用恒定。模板只需确定一次, 之后在整个文件中复用。
+        """
+        if isinstance(path_or_file, sixmini.string_types):
+            with io.open(path_or_file, "r", encoding=encoding,
+                         newline="") as f:
+                for value in self.iter_file(
+                        f, column=column, pattern=pattern,
+                        delimiter=delimiter, skip_header=skip_header,
+                        template=template, epoch=epoch):
+                    yield value
+            return
+
+        f = path_or_file
+        if skip_header:
+            next(f, None)
+        fields = self._iter_fields(
+            f, column=column, pattern=pattern, delimiter=delimiter)
+        datetimes = self._iter_str2datetime(fields, template)
+        if epoch:
+            for a_datetime in datetimes:
+                yield int(to_utctimestamp(a_datetime))
+        else:
+            for a_datetime in datetimes:
+                yield a_datetime
+
+    # --- Mixed type bulk parse ---
+    def _parse_group(self, value_type, group, tolerant, fallback=False):
+        """
+        Convert a group of values of the same type with its batch path,
+        failed value is None if ``tolerant``.
+        """
+        if value_type in _exact_string_types:
+            if tolerant:
+                if fallback:
+                    try_str2datetime = self._try_str2datetime_fallback
+                else:
+                    try_str2datetime = self._try_str2datetime
+                return list(self._iter_str2datetime(
+                    group, None, try_str2datetime))
+            return list(self._iter_str2datetime(group))
+        elif value_type in _exact_integer_types:
+            try:
+                return _epoch_ints(group, self.epoch_unit)
+            except OverflowError:
+                if not tolerant:
+                    raise
+            converter = self.parse_datetime
+        elif value_type is float:
+            if not tolerant:
+                return [from_utctimestamp(value) for value in group]
+            return [_try_from_utctimestamp(value) for value in group]
+        elif value_type is datetime:
+            return group
+        elif value_type is date:
+            return [
+                datetime(value.year, value.month, value.day)
+                for value in group
+            ]
+        elif value_type is type(None):
+            if not tolerant:
+                raise TypeError("Unable to parse datetime from None")
+            return [None] * len(group)
+        elif value_type in _exact_buffer_types:
+            if tolerant:
+                if fallback:
+                    try_str2datetime = self._try_str2datetime_fallback
+                else:
+                    try_str2datetime = self._try_str2datetime
+                return [
+                    self._try_buffer2datetime(value, try_str2datetime)
+                    for value in group
+                ]
+            converter = self.buffer2datetime
+        else:
+            converter = self.parse_datetime
+
+        if not tolerant:
+            return [converter(value) for value in group]
+        results = list()
+        for value in group:
+            try:
+                results.append(converter(value))
+            except (ValueError, TypeError, OverflowError):
+                results.append(None)
+        return results
+
+    def parse_datetime_many(self, values, as_numpy=False,
+                            dtype="datetime64[us]", errors="raise",
+                            fallback=False):
+        """
+        Parse many values of mixed types to datetime, same rules as
+        :meth:`Parser.parse_datetime`.
+
+        The values are partitioned by type in one pass, each group is
+        converted by its batch path: strings by the template learned once,
+        see :meth:`Parser.str2datetime_many`, integers by epoch arithmetic,
+        dates to midnight. Results are scattered back in the input order.
+
+        :param values: iterable of string, bytes like object, integer,
+            float, date or datetime.
+        :param as_numpy: returns a numpy datetime64 array instead of list.
+        :param dtype: numpy dtype used when ``as_numpy=True``.
+        :param errors: "raise", "coerce" or "ignore", see
+            :meth:`Parser.str2datetime_many`.
+        :param fallback: see :meth:`Parser.str2datetime_many`.
+        :return: list of datetime object. If ``errors`` is "coerce" or
+            "ignore", returns (values, failure mask).
+
+        **中文文档**
+
+        批量解析混合类型的数据。先按类型分组, 再对每组使用最快的批量转换方法,
+        最后按原来的顺序放回, 避免了对每个值都做一遍类型判断。
+        """
+        _check_errors(errors)
+        tolerant = errors != "raise"
+        values = list(values)
+        groups = dict()
+        for i, value in enumerate(values):
+            value_type = type(value)
+            try:
+                groups[value_type].append(i)
+            except KeyError:
+                groups[value_type] = [i]
+
+        results = [None] * len(values)
+        for value_type, indexes in groups.items():
+            group = [values[i] for i in indexes]
+            for i, result in zip(
+                    indexes, self._parse_group(
+                        value_type, group, tolerant, fallback)):
+                results[i] = result
+
+        if tolerant:
+            return _collect(values, results, errors, as_numpy, dtype)
+        if as_numpy:
+            return _fromiter(results, dtype)
+        return results
+
     def reset(self):
         """
-        Reset :class:`Parser` behavior to default.
+        Reset :class:`Parser` behavior to default, close the dateutil
+        fallback circuit.
         """
-        self.str2datetime = self._str2datetime
+        self._circuit_open = False
+        self._fallback_count = 0
 
     def parse_date(self, value):
         """
@@ -230,12 +1759,15 @@ class Parser(object):
         If input data type is:
 
         - string: parse date from it
+        - bytes like object: parse date from it
         - integer: use from ordinal
         - datetime: use date part
         - date: just return it
         """
         if isinstance(value, sixmini.string_types):
             return self.str2date(value)
+        elif isinstance(value, _buffer_types):
+            return self.buffer2date(value)
         elif value is None:
             raise TypeError("Unable to parse date from %r" % value)
         elif isinstance(value, sixmini.integer_types):
@@ -253,17 +1785,21 @@ class Parser(object):
 
         If input data type is:
 
-        - string: parse datetime from it
-        - integer: use from ordinal
+        - string: parse datetime from it, numeric string is epoch
+        - bytes like object: parse datetime from it
+        - integer: epoch, unit is ``epoch_unit`` or guessed by magnitude
+        - float: epoch seconds
         - date: use date part and set hour, minute, second to zero
         - datetime: just return it
         """
         if isinstance(value, sixmini.string_types):
             return self.str2datetime(value)
+        elif isinstance(value, _buffer_types):
+            return self.buffer2datetime(value)
         elif value is None:
             raise TypeError("Unable to parse datetime from %r" % value)
         elif isinstance(value, sixmini.integer_types):
-            return from_utctimestamp(value)
+            return parse_epoch(value, self.epoch_unit)
         elif isinstance(value, float):
             return from_utctimestamp(value)
         elif isinstance(value, datetime):
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parser instrumentation.
+
+**中文文档**
+
+解析器的统计数据: 各模板命中次数, 默认模板未命中次数, 重新扫描次数,
+dateutil 回退次数, 以及耗时分布。
+"""
+
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+try:
+    _timer = time.perf_counter
+except AttributeError:  # pragma: no cover
+    _timer = time.time
+
+ISO8601 = "iso8601"
+"""
+Key of :func:`rolex.parse.parse_iso8601` fast path in template hit counts.
+"""
+
+EPOCH = "epoch"
+"""
+Key of :func:`rolex.parse.parse_epoch` in template hit counts.
+"""
+
+
+class ParserStats(object):
+    """
+    Counters and latency histogram of a :class:`~rolex.parse.Parser`.
+
+    - ``calls``: number of parsed strings.
+    - ``template_hits``: template -> number of strings it matched.
+    - ``default_misses``: number of times the default template missed.
+    - ``rescans``: number of times the full template list was scanned, to
+      find candidate templates of a new string signature.
+    - ``fallbacks``: number of times :meth:`dateutil.parser.parse` was used.
+    - ``latency_histogram``: number of calls per latency bucket.
+    """
+
+    latency_buckets = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 10000)
+    """
+    Upper bounds of latency buckets, in microseconds.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all counters to zero.
+        """
+        self.calls = 0
+        self.total_time = 0.0
+        self.template_hits = dict()
+        self.default_misses = 0
+        self.rescans = 0
+        self.fallbacks = 0
+        self.latency_histogram = [0] * (len(self.latency_buckets) + 1)
+
+    def hit(self, template):
+        """
+        Count a template hit.
+        """
+        self.template_hits[template] = self.template_hits.get(template, 0) + 1
+
+    def record_latency(self, seconds):
+        """
+        Count a call and its latency.
+        """
+        self.calls += 1
+        self.total_time += seconds
+        self.latency_histogram[
+            bisect_left(self.latency_buckets, seconds * 1000000)] += 1
+
+    def to_dict(self):
+        """
+        Export statistics as a dict.
+        """
+        labels = ["<=%sus" % bound for bound in self.latency_buckets]
+        labels.append(">%sus" % self.latency_buckets[-1])
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "template_hits": dict(self.template_hits),
+            "default_misses": self.default_misses,
+            "rescans": self.rescans,
+            "fallbacks": self.fallbacks,
+            "latency_histogram": OrderedDict(
+                zip(labels, self.latency_histogram)),
+        }
@@ -0,0 +1,622 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compiled datetime string template.
+
+A strptime style template, for example ``"%Y-%m-%d %H:%M:%S"``, is translated
+into a regular expression and a specialized builder function, which creates
+the datetime straight from the captured integers. Unlike
+:meth:`datetime.strptime`, a miss doesn't raise, :meth:`Template.match` just
+returns ``None``.
+
+**中文文档**
+
+将 strptime 风格的模板预编译为正则表达式以及专用的构造函数。匹配失败时不会
+抛出异常, 而是返回 ``None``, 这样在逐个尝试模板时就避免了异常带来的开销。
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+
+try:
+    from .tz import fixed_offset
+except:  # pragma: no cover
+    from rolex.tz import fixed_offset
+
+
+def _alternatives(names):
+    """
+    Build a regex alternation, longest name first, so ``"September"`` is not
+    shadowed by ``"Sep"``.
+    """
+    names = sorted(set(name.lower() for name in names if name),
+                   key=len, reverse=True)
+    return "|".join(re.escape(name) for name in names)
+
+
+#: locale -> (month names, month abbreviations, day names, day
+#: abbreviations), months start from January, days start from Monday.
+#: English is built in, it doesn't depend on ``LC_TIME``.
+_locale_names = {
+    "en": (
+        ("January", "February", "March", "April", "May", "June", "July",
+         "August", "September", "October", "November", "December"),
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep",
+         "Oct", "Nov", "Dec"),
+        ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday",
+         "Saturday", "Sunday"),
+        ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"),
+    ),
+}
+
+
+def add_locale(name, month_names, month_abbrs, day_names, day_abbrs):
+    """
+    Register month and day names of a language, so templates compiled with
+    ``locales=[name]`` understand them, in addition to English.
+
+    :param name: locale name, for example ``"de"``.
+    :param month_names: 12 month names, starts from January.
+    :param month_abbrs: 12 abbreviated month names.
+    :param day_names: 7 day names, starts from Monday.
+    :param day_abbrs: 7 abbreviated day names.
+
+    Usage::
+
+        >>> add_locale(
+        ...     "de",
+        ...     ["Januar", "Februar", "März", ...],
+        ...     ["Jan", "Feb", "Mär", ...],
+        ...     ["Montag", "Dienstag", ...],
+        ...     ["Mo", "Di", ...],
+        ... )
+        >>> Template("%d. %B %Y", locales=["de"]).match("15. März 2014")
+        datetime.datetime(2014, 3, 15, 0, 0)
+
+    **中文文档**
+
+    注册一种语言的月份和星期名称。使用 ``locales=[name]`` 编译的模板除了
+    英语之外也能识别这些名称。
+    """
+    names = (
+        tuple(month_names), tuple(month_abbrs),
+        tuple(day_names), tuple(day_abbrs),
+    )
+    if [len(value) for value in names] != [12, 12, 7, 7]:
+        raise ValueError(
+            "locale %r needs 12 month names, 12 month abbreviations, "
+            "7 day names and 7 day abbreviations!" % name)
+    _locale_names[name] = names
+    _name_tables.clear()
+
+
+class _NameTable(object):
+    """
+    Precomputed case insensitive lookup tables of month and day names, of
+    English and the extra locales.
+    """
+
+    def __init__(self, locales=()):
+        month_names, month_abbrs, day_names, day_abbrs = [
+            list(names) for names in _locale_names["en"]]
+        month_lookup = dict()
+        for locale in ("en",) + tuple(locales):
+            try:
+                names = _locale_names[locale]
+            except KeyError:
+                raise ValueError("unknown locale %r!" % locale)
+            if locale != "en":
+                month_names.extend(names[0])
+                month_abbrs.extend(names[1])
+                day_names.extend(names[2])
+                day_abbrs.extend(names[3])
+            for table in names[:2]:
+                for i, name in enumerate(table):
+                    month_lookup.setdefault(name.lower(), i + 1)
+
+        self.month_lookup = month_lookup
+        self.directive_regex = dict(_directive_regex)
+        self.directive_regex.update({
+            "B": _alternatives(month_names),
+            "b": _alternatives(month_abbrs),
+            "A": _alternatives(day_names),
+            "a": _alternatives(day_abbrs),
+        })
+        self.namespace = dict(_builder_namespace)
+        self.namespace["_month_lookup"] = month_lookup
+        self.bytes_namespace = dict(_bytes_builder_namespace)
+        self.bytes_namespace["_month_lookup"] = _bytes_keys(month_lookup)
+
+
+#: tuple of locales -> :class:`_NameTable`
+_name_tables = dict()
+
+
+def _get_name_table(locales):
+    key = tuple(locales or ())
+    try:
+        return _name_tables[key]
+    except KeyError:
+        table = _name_tables[key] = _NameTable(key)
+        return table
+
+
+_ampm_offset = {"am": 0, "pm": 12}
+
+_tzname_list = ["utc", "gmt"] + [name.lower() for name in time.tzname]
+
+#: directive -> regex, the same as the one :mod:`_strptime` uses
+_directive_regex = {
+    "Y": r"\d\d\d\d",
+    "y": r"\d\d",
+    "m": r"1[0-2]|0[1-9]|[1-9]",
+    "d": r"3[01]|[12]\d|0[1-9]|[1-9]| [1-9]",
+    "H": r"2[0-3]|[0-1]\d|\d",
+    "I": r"1[0-2]|0[1-9]|[1-9]",
+    "M": r"[0-5]\d|\d",
+    "S": r"6[0-1]|[0-5]\d|\d",
+    "f": r"[0-9]{1,6}",
+    "p": _alternatives(_ampm_offset),
+    "Z": _alternatives(_tzname_list),
+    "z": r"[+-]\d\d:?[0-5]\d(?::?[0-5]\d(?:\.\d{1,6})?)?|Z",
+}
+
+
+#: directive -> regex of the :func:`signature` of what the directive matches
+_directive_shape = {
+    "Y": "9999",
+    "y": "99",
+    "m": "9{1,2}",
+    "d": "9{1,2}| 9",
+    "H": "9{1,2}",
+    "I": "9{1,2}",
+    "M": "9{1,2}",
+    "S": "9{1,2}",
+    "f": "9{1,6}",
+    "p": "a+",
+    "B": r"[^\W\d_]+\.?",
+    "b": r"[^\W\d_]+\.?",
+    "A": r"[^\W\d_]+\.?",
+    "a": r"[^\W\d_]+\.?",
+    "Z": "a+",
+    "z": r"[+-]99:?99(?::?99(?:\.9{1,6})?)?|a",
+}
+
+#: translate table of text string
+_signature_table = dict()
+#: translate table of byte string, Python 2 ``str`` doesn't take a dict
+_signature_byte_table = bytearray(range(256))
+for _char in "0123456789":
+    _signature_table[ord(_char)] = u"9"
+    _signature_byte_table[ord(_char)] = ord("9")
+for _char in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ":
+    _signature_table[ord(_char)] = u"a"
+    _signature_byte_table[ord(_char)] = ord("a")
+_signature_byte_table = bytes(_signature_byte_table)
+
+
+def signature(text):
+    """
+    Cheap shape signature of a string, every digit becomes ``9`` and every
+    ascii letter becomes ``a``, delimiters are kept. For example,
+    ``"2014-01-15 5:58:31 PM"`` -> ``"9999-99-99 9:99:99 aa"``.
+
+    Strings with the same signature can only be matched by the same set of
+    templates, see :meth:`Template.could_match`.
+    """
+    if isinstance(text, bytes):
+        return text.translate(_signature_byte_table)
+    return text.translate(_signature_table)
+
+
+def _expand_year(year):
+    """
+    Two digits year, 69 - 99 is 19XX, 00 - 68 is 20XX, same as strptime.
+    """
+    if year <= 68:
+        return year + 2000
+    else:
+        return year + 1900
+
+
+_zero_delta = timedelta(0)
+
+
+def _parse_offset(text):
+    """
+    Parse ``%z`` utc offset string, ``Z``, ``+HHMM``, ``-HH:MM``,
+    ``+HH:MM:SS.ffffff``, into an interned fixed offset tzinfo, see
+    :func:`rolex.tz.fixed_offset`.
+    """
+    if text == "Z" or text == "z":
+        return fixed_offset(_zero_delta)
+    return fixed_offset(_offset_delta(text))
+
+
+def _offset_delta(text):
+    sign = -1 if text[0] == "-" else 1
+    text = text[1:].replace(":", "")
+    if "." in text:
+        text, microsecond = text.split(".")
+        microsecond = int(microsecond.ljust(6, "0"))
+    else:
+        microsecond = 0
+    delta = timedelta(
+        hours=int(text[0:2]),
+        minutes=int(text[2:4]),
+        seconds=int(text[4:6] or 0),
+        microseconds=microsecond,
+    )
+    return sign * delta
+
+
+def _parse_offset_bytes(text):
+    return _parse_offset(text.decode("ascii"))
+
+
+def _bytes_keys(mapping):
+    return dict(
+        (key.encode("utf-8"), value) for key, value in mapping.items())
+
+
+#: microseconds = int(fraction) * _fraction_scale[len(fraction)]
+_fraction_scale = (0, 100000, 10000, 1000, 100, 10, 1)
+
+_builder_namespace = {
+    "datetime": datetime,
+    "_expand_year": _expand_year,
+    "_fraction_scale": _fraction_scale,
+    "_ampm_offset": _ampm_offset,
+    "_parse_offset": _parse_offset,
+}
+
+#: namespace of the builder working on bytes captured from a buffer
+_bytes_builder_namespace = dict(_builder_namespace)
+_bytes_builder_namespace.update({
+    "_ampm_offset": _bytes_keys(_ampm_offset),
+    "_parse_offset": _parse_offset_bytes,
+})
+
+
+class Template(object):
+    """
+    A precompiled datetime string template.
+
+    :param template: strptime style template, supported directives are
+        ``%Y %y %m %d %H %I %M %S %f %p %B %b %A %a %Z %z %%``.
+    :param example: optional example string, only used for documentation.
+    :param locales: optional extra locales of month and day names, see
+        :func:`add_locale`. English names are always understood, they
+        don't depend on ``LC_TIME``.
+
+    **中文文档**
+
+    预编译的日期时间模板。月份和星期名称使用预先计算好的英语查找表, 不受
+    ``LC_TIME`` 影响, 也可以通过 ``locales`` 参数支持其他语言。
+    """
+
+    def __init__(self, template, example=None, locales=None):
+        self.template = template
+        self.example = example
+        self.locales = tuple(locales or ())
+        self._names = _get_name_table(self.locales)
+        regex, directives = self._translate(
+            template, self._names.directive_regex)
+        self.pattern = re.compile(
+            regex + r"\Z", re.IGNORECASE | re.UNICODE)
+        self._match = self.pattern.match
+        self._build = self._compile_builder(directives, self._names.namespace)
+        self._regex = regex
+        self._directives = directives
+        self._bytes_match = None
+        self._bytes_build = None
+        shape_regex, _ = self._translate(
+            template, _directive_shape, literal=signature)
+        self.shape_pattern = re.compile(shape_regex + r"\Z", re.UNICODE)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.template)
+
+    @staticmethod
+    def _translate(template, directive_regex, literal=None):
+        """
+        Translate strptime template to regex, and returns the directives
+        in the order of the capture groups.
+
+        :param directive_regex: directive -> regex mapping.
+        :param literal: optional function applied to literal characters.
+        """
+        chunks = list()
+        directives = list()
+        i, length = 0, len(template)
+        while i < length:
+            char = template[i]
+            if char == "%":
+                if i + 1 >= length:
+                    raise ValueError(
+                        "stray %% in template %r!" % template)
+                directive = template[i + 1]
+                i += 2
+                if directive == "%":
+                    chunks.append("%")
+                    continue
+                if directive not in directive_regex:
+                    raise ValueError(
+                        "unsupported directive %%%s in template %r!" % (
+                            directive, template))
+                chunks.append("(%s)" % directive_regex[directive])
+                directives.append(directive)
+            elif char.isspace():
+                while i < length and template[i].isspace():
+                    i += 1
+                chunks.append(r"\s+")
+            else:
+                if literal is not None:
+                    char = literal(char)
+                chunks.append(re.escape(char))
+                i += 1
+        return "".join(chunks), directives
+
+    @staticmethod
+    def _compile_builder(directives, namespace=None):
+        """
+        Generate a function that takes the tuple of captured strings and
+        returns the datetime.
+
+        :param namespace: globals of the generated function, default
+            works on str.
+        """
+        index = dict((directive, i) for i, directive in enumerate(directives))
+
+        def get(directive):
+            return "g[%d]" % index[directive]
+
+        if "Y" in index:
+            year = "int(%s)" % get("Y")
+        elif "y" in index:
+            year = "_expand_year(int(%s))" % get("y")
+        else:
+            year = "1900"
+
+        if "m" in index:
+            month = "int(%s)" % get("m")
+        elif "B" in index:
+            month = "_month_lookup[%s.lower()]" % get("B")
+        elif "b" in index:
+            month = "_month_lookup[%s.lower()]" % get("b")
+        else:
+            month = "1"
+
+        day = "int(%s)" % get("d") if "d" in index else "1"
+
+        if "H" in index:
+            hour = "int(%s)" % get("H")
+        elif "I" in index:
+            hour = "int(%s) %% 12" % get("I")
+            if "p" in index:
+                hour = "%s + _ampm_offset[%s.lower()]" % (hour, get("p"))
+        else:
+            hour = "0"
+
+        minute = "int(%s)" % get("M") if "M" in index else "0"
+        second = "int(%s)" % get("S") if "S" in index else "0"
+        if "f" in index:
+            microsecond = "int(%s) * _fraction_scale[len(%s)]" % (
+                get("f"), get("f"))
+        else:
+            microsecond = "0"
+
+        args = [year, month, day, hour, minute, second, microsecond]
+        if "z" in index:
+            args.append("_parse_offset(%s)" % get("z"))
+
+        source = "def build(g):\n    return datetime(%s)\n" % ", ".join(args)
+        if namespace is None:
+            namespace = _builder_namespace
+        namespace = dict(namespace)
+        exec(source, namespace)
+        return namespace["build"]
+
+    def could_match(self, text_signature):
+        """
+        Test if a string with this :func:`signature` could be matched by
+        this template. It never gives false negative.
+        """
+        return self.shape_pattern.match(text_signature) is not None
+
+    def match(self, text):
+        """
+        Parse datetime from string.
+
+        :return: a datetime object, or ``None`` if the string doesn't match
+            this template, or it is not a valid date.
+        """
+        m = self._match(text)
+        if m is None:
+            return None
+        try:
+            return self._build(m.groups())
+        except (ValueError, KeyError):
+            return None
+
+    def _compile_bytes(self):
+        """
+        Compile bytes pattern and builder, on first use.
+        """
+        pattern = re.compile(
+            self._regex.encode("utf-8") + br"\Z", re.IGNORECASE)
+        self._bytes_build = self._compile_builder(
+            self._directives, self._names.bytes_namespace)
+        self._bytes_match = pattern.match
+
+    def match_buffer(self, buffer, pos=0, endpos=None):
+        """
+        Parse datetime from a slice of bytes like object, ``bytes``,
+        ``bytearray``, ``memoryview`` or ``mmap``, without creating the
+        intermediate string.
+
+        :param pos: start offset of the slice.
+        :param endpos: end offset of the slice, default end of the buffer.
+        :return: a datetime object, or ``None``.
+        """
+        if self._bytes_match is None:
+            self._compile_bytes()
+        if endpos is None:
+            m = self._bytes_match(buffer, pos)
+        else:
+            m = self._bytes_match(buffer, pos, endpos)
+        if m is None:
+            return None
+        try:
+            return self._bytes_build(m.groups())
+        except (ValueError, KeyError):
+            return None
+
+
+class TemplateRegistry(object):
+    """
+    An ordered collection of compiled templates with priorities. Templates
+    with higher priority are tried first, templates with the same priority
+    are tried in the order they are added.
+
+    :param templates: iterable of template string, ``(template, example)``
+        tuple or :class:`Template`.
+    :param on_change: optional callback, called without argument after the
+        registry is changed.
+    :param locales: extra locales of month and day names, used to compile
+        template strings, see :func:`add_locale`.
+
+    Usage::
+
+        >>> registry = TemplateRegistry(["%Y-%m-%d %H:%M:%S"])
+        >>> registry.add("%d/%m/%Y %H:%M", "15/01/2014 17:58", priority=10)
+        >>> registry.templates
+        ['%d/%m/%Y %H:%M', '%Y-%m-%d %H:%M:%S']
+
+    **中文文档**
+
+    带优先级的模板集合。优先级高的模板先尝试, 优先级相同的按照添加顺序尝试。
+    添加模板时会用示例字符串验证模板, 并预编译。
+    """
+
+    def __init__(self, templates=(), on_change=None, locales=None):
+        self.locales = tuple(locales or ())
+        self._priority = dict()
+        self._sequence = dict()
+        self._compiled = dict()
+        self._counter = 0
+        self.on_change = None
+        self.compiled = list()
+        """
+        list of :class:`Template`, in the order they are tried.
+        """
+        for template in templates:
+            if isinstance(template, tuple):
+                self.add(*template)
+            else:
+                self.add(template)
+        self.on_change = on_change
+
+    def __len__(self):
+        return len(self.compiled)
+
+    def __iter__(self):
+        return iter(self.compiled)
+
+    def __contains__(self, template):
+        return template in self._compiled
+
+    @property
+    def templates(self):
+        """
+        list of template string, in the order they are tried.
+        """
+        return [template.template for template in self.compiled]
+
+    def _rebuild(self):
+        self.compiled = sorted(
+            self._compiled.values(),
+            key=lambda template: (
+                -self._priority[template.template],
+                self._sequence[template.template],
+            ),
+        )
+        if self.on_change is not None:
+            self.on_change()
+
+    def get(self, template):
+        """
+        Get the compiled :class:`Template`, None if it's not registered.
+        """
+        return self._compiled.get(template)
+
+    def add(self, template, example=None, priority=0):
+        """
+        Register a template. It's validated against the example, and
+        precompiled. Registering an existing template again updates it.
+
+        :param template: template string or :class:`Template`.
+        :param example: optional example string, template has to match it.
+        :param priority: higher priority is tried first.
+        :return: the compiled :class:`Template`.
+        """
+        if isinstance(template, Template):
+            compiled = template
+            if example is None:
+                example = compiled.example
+        else:
+            compiled = Template(template, example, self.locales)
+        if example is not None and compiled.match(example) is None:
+            raise ValueError("template %r doesn't match its example %r!" % (
+                compiled.template, example))
+
+        key = compiled.template
+        if key not in self._sequence:
+            self._sequence[key] = self._counter
+            self._counter += 1
+        self._compiled[key] = compiled
+        self._priority[key] = priority
+        self._rebuild()
+        return compiled
+
+    def remove(self, template):
+        """
+        Unregister a template.
+        """
+        try:
+            del self._compiled[template]
+        except KeyError:
+            raise KeyError("template %r is not registered!" % template)
+        del self._priority[template]
+        del self._sequence[template]
+        self._rebuild()
+
+    def set_priority(self, template, priority):
+        """
+        Change the priority of a registered template.
+        """
+        if template not in self._compiled:
+            raise KeyError("template %r is not registered!" % template)
+        self._priority[template] = priority
+        self._rebuild()
+
+    def reorder(self, templates):
+        """
+        Reorder the registry, the given templates come first in the given
+        order, then the others in their current order. All priorities are
+        reset to zero.
+        """
+        templates = list(templates)
+        for template in templates:
+            if template not in self._compiled:
+                raise KeyError("template %r is not registered!" % template)
+        given = set(templates)
+        rest = [
+            template for template in self.templates if template not in given
+        ]
+        for i, template in enumerate(templates + rest):
+            self._sequence[template] = i
+            self._priority[template] = 0
+        self._counter = len(self._sequence)
+        self._rebuild()
@@ -1,13 +1,72 @@
 # -*- coding: utf-8 -*-
 
-from dateutil.tz import tzutc, tzlocal
+"""
+Time zones. The local machine time zone ``local`` reads system zone state,
+it's created on first access.
+"""
+
+import sys
+
+from dateutil.tz import tzutc, tzlocal, tzoffset
+
+try:
+    from datetime import timezone
+except ImportError:  # pragma: no cover
+    timezone = None
 
 utc = tzutc()
 """
 UTC timezone
 """
 
-local = tzlocal()
-"""
-Local machine time zone
-"""
+if sys.version_info < (3, 7):  # pragma: no cover
+    local = tzlocal()
+    """
+    Local machine time zone
+    """
+
+
+def __getattr__(name):
+    """
+    Create ``local``, the local machine time zone, on first access.
+    """
+    if name == "local":
+        global local
+        local = tzlocal()
+        return local
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+_fixed_offset_cache = dict()
+_fixed_offset_cache_size = 1024
+
+
+def fixed_offset(delta):
+    """
+    Get the fixed offset tzinfo of a utc offset.
+
+    tzinfo objects are interned in a process wide cache, parsing millions
+    of timestamps with a handful of distinct utc offsets only creates a
+    handful of tzinfo objects.
+
+    :param delta: utc offset, a timedelta object.
+    :return: a tzinfo object, zero offset is always :data:`utc`.
+
+    **中文文档**
+
+    返回固定时差的 tzinfo 对象。同一个时差始终返回同一个对象, 避免解析时为
+    每个字符串都创建新的 tzinfo。
+    """
+    try:
+        return _fixed_offset_cache[delta]
+    except KeyError:
+        pass
+    if not delta:
+        tzinfo = utc
+    elif timezone is None:  # pragma: no cover
+        tzinfo = tzoffset(None, delta.days * 86400 + delta.seconds)
+    else:
+        tzinfo = timezone(delta)
+    if len(_fixed_offset_cache) < _fixed_offset_cache_size:
+        _fixed_offset_cache[delta] = tzinfo
+    return tzinfo
@@ -8,9 +8,11 @@ time math calculation.
 from datetime import date, datetime, timedelta
 
 try:
-    from .tz import utc, local
+    from . import tz
+    from .tz import utc
 except:  # pragma: no cover
-    from rolex.tz import utc, local
+    from rolex import tz
+    from rolex.tz import utc
 
 
 def to_ordinal(a_date):
@@ -112,7 +114,7 @@ def utc_to_local(utc_datetime, keep_tzinfo=False):
     :param utc_datetime:
     :param keep_tzinfo:
     """
-    return utc_to_tz(utc_datetime, local, keep_tzinfo)
+    return utc_to_tz(utc_datetime, tz.local, keep_tzinfo)
 
 
 def is_weekend(d_or_dt):
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from pytest import raises
+from rolex import business
+from rolex.business import HolidayCalendar
+from datetime import date, datetime
+
+calendar = HolidayCalendar(["2014-01-01", "2014-01-04", date(2014, 12, 25)])
+
+
+def test_holiday_calendar():
+    # 2014-01-04 is Saturday, not stored
+    assert calendar.holidays == [date(2014, 1, 1), date(2014, 12, 25)]
+    with raises(ValueError):
+        HolidayCalendar(weekend=range(7))
+    with raises(ValueError):
+        HolidayCalendar(weekend=[7])
+
+
+def test_is_business_day():
+    assert business.is_business_day("2014-01-03") is True
+    assert business.is_business_day("2014-01-04") is False
+    assert business.is_business_day(date(2014, 1, 1)) is True
+    assert business.is_business_day(date(2014, 1, 1), calendar) is False
+    assert business.is_business_day(
+        "2014-01-04", HolidayCalendar(weekend=[4])) is True
+
+
+def test_add_business_days():
+    assert business.add_business_days("2013-12-31", 1, calendar) == \
+        date(2014, 1, 2)
+    assert business.add_business_days("2014-01-02", -1, calendar) == \
+        date(2013, 12, 31)
+    assert business.add_business_days("2014-01-03", 1) == date(2014, 1, 6)
+    # non business day is rolled first
+    assert business.add_business_days("2014-01-04", 0) == date(2014, 1, 6)
+    assert business.add_business_days("2014-01-04", -1) == date(2014, 1, 2)
+    assert business.add_business_days(
+        datetime(2014, 1, 3, 8, 30), 1) == datetime(2014, 1, 6, 8, 30)
+    # whole year: 261 weekdays, 2 holidays
+    assert business.add_business_days("2013-12-31", 259, calendar) == \
+        date(2014, 12, 31)
+
+
+def test_business_days_between():
+    assert business.business_days_between("2014-01-01", "2015-01-01") == 261
+    assert business.business_days_between(
+        "2014-01-01", "2015-01-01", calendar) == 259
+    assert business.business_days_between(
+        "2015-01-01", "2014-01-01", calendar) == -259
+    assert business.business_days_between("2014-01-04", "2014-01-06") == 0
+
+
+def test_many():
+    assert business.is_business_day_many(
+        ["2014-01-01", "2014-01-02"], calendar) == [False, True]
+    assert business.add_business_days_many(
+        ["2013-12-31", datetime(2014, 1, 3, 8)], [1, -1], calendar) == \
+        [date(2014, 1, 2), datetime(2014, 1, 2, 8)]
+    assert business.business_days_between_many(
+        ["2014-01-01", "2014-01-06"], "2014-01-08", calendar) == [4, 2]
+    assert business.business_days_between_many(
+        ["2014-01-01"], ["2013-12-30"]) == [-2]
+
+
+def test_many_numpy():
+    np = pytest.importorskip("numpy")
+    array = np.array(["2013-12-31", "2014-01-04", "NaT"],
+                     dtype="datetime64[s]")
+    assert business.is_business_day_many(array, calendar).tolist() == \
+        [True, False, False]
+    assert business.add_business_days_many(array, [1, -1, 1], calendar) \
+        .astype(str).tolist() == ["2014-01-02", "2014-01-02", "NaT"]
+    assert business.business_days_between_many(
+        array[:2], "2013-12-30", calendar).tolist() == [-1, -4]
+
+    # numpy integer scalar on the list path
+    assert business.add_business_days_many(
+        ["2013-12-31"], np.int64(1), calendar) == [date(2014, 1, 2)]
+
+
+if __name__ == "__main__":
+    import os
+
+    basename = os.path.basename(__file__)
+    pytest.main([basename, "-s", "--tb=native"])
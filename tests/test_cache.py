@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from pytest import raises
+
+from rolex.cache import Cache
+
+
+def test_lru():
+    cache = Cache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.info() == {
+        "hits": 1, "misses": 1, "currsize": 2, "maxsize": 2, "policy": "lru",
+    }
+
+
+def test_fifo():
+    cache = Cache(2, policy="fifo")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "a" not in cache
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+def test_invalid():
+    with raises(ValueError):
+        Cache(0)
+    with raises(ValueError):
+        Cache(10, policy="random")
+
+
+if __name__ == "__main__":
+    import os
+
+    basename = os.path.basename(__file__)
+    pytest.main([basename, "-s", "--tb=native"])
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import io
+import pytest
+from pytest import raises
+
+from datetime import date, datetime, timedelta
+from dateutil.tz import tzoffset
+from rolex.format import (
+    Formatter, get_formatter,
+    datetime2str, date2str, datetime2str_many, date2str_many,
+)
+from rolex.parse import datetime_template_list, date_template_list
+
+datetimes = [
+    datetime(2014, 1, 15, 0, 5, 7),
+    datetime(2014, 1, 15, 12, 0, 0, 123),
+    datetime(2014, 1, 15, 17, 58, 31, 999999),
+    datetime(1999, 12, 31, 23, 59, 59, 1),
+    datetime(2000, 2, 29, 13, 0, 0, tzinfo=tzoffset(None, -4 * 3600)),
+    datetime(2000, 2, 29, 13, 0, 0, tzinfo=tzoffset(None, 19815)),
+]
+
+
+def test_same_as_strftime():
+    for template in datetime_template_list + date_template_list:
+        formatter = get_formatter(template)
+        for a_datetime in datetimes:
+            assert formatter.format(a_datetime) == \
+                a_datetime.strftime(template)
+        assert list(formatter.iter_format(datetimes)) == \
+            [a_datetime.strftime(template) for a_datetime in datetimes]
+        for a_date in [date(2014, 1, 15), date(1999, 12, 31)]:
+            assert formatter.format_date(a_date) == a_date.strftime(template)
+
+    template = "%%Y%Y %%%H 100%%"
+    assert datetime2str(datetimes[0], template) == \
+        datetimes[0].strftime(template)
+
+
+def test_date_part():
+    assert Formatter("%Y-%m-%d %H:%M:%S")._date_first is True
+    assert Formatter("%H:%M %m/%d/%Y")._date_first is False
+    assert Formatter("%Y-%m-%d")._date_first is None
+    assert Formatter("%H %Y %M %m")._date_first is None
+
+    data = [datetime(2014, 1, 15) + timedelta(hours=i) for i in range(100)]
+    for template in ["%Y-%m-%d %H:%M:%S", "%I %p %m/%d/%Y"]:
+        assert datetime2str_many(data, template) == \
+            [a_datetime.strftime(template) for a_datetime in data]
+
+
+def test_datetime2str():
+    assert datetime2str(datetime(2014, 1, 15, 17, 58, 31)) == \
+        "2014-01-15 17:58:31"
+    assert date2str(date(2014, 1, 15)) == "2014-01-15"
+    assert date2str(date(2014, 1, 15), "%A, %B %d, %Y") == \
+        "Wednesday, January 15, 2014"
+
+    with raises(ValueError):
+        datetime2str(datetime(2014, 1, 15), "%Y-%Q")
+    with raises(ValueError):
+        datetime2str(datetime(2014, 1, 15), "%Y-%")
+
+
+def test_output(tmpdir):
+    data = [datetime(2014, 1, 15, 17, 58, 31), datetime(2014, 1, 16)]
+    assert datetime2str_many(data) == \
+        ["2014-01-15 17:58:31", "2014-01-16 00:00:00"]
+    assert datetime2str_many(data, "%Y%m%d", sep=",") == "20140115,20140116"
+    assert date2str_many([date(2014, 1, 15)], sep="\n") == "2014-01-15"
+
+    path = str(tmpdir.join("datetimes.txt"))
+    assert datetime2str_many(data, path_or_file=path, chunksize=1) == 2
+    with io.open(path, "r") as f:
+        assert f.read() == "2014-01-15 17:58:31\n2014-01-16 00:00:00\n"
+
+    f = io.StringIO()
+    assert date2str_many(
+        [date(2014, 1, 15), date(2014, 1, 16)], path_or_file=f, sep=";") == 2
+    assert f.getvalue() == "2014-01-15;2014-01-16;"
+
+
+if __name__ == "__main__":
+    import os
+
+    basename = os.path.basename(__file__)
+    pytest.main([basename, "-s", "--tb=native"])
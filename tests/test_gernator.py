@@ -59,10 +59,42 @@ def test_time_series():
         datetime(2014, 1, 3),
     ]
 
+    # negative frequency with periods
+    assert generator.time_series(
+        start="2014-01-03", periods=3, freq="-1d",
+    ) == [datetime(2014, 1, 3), datetime(2014, 1, 2), datetime(2014, 1, 1)]
+    assert generator.time_series(
+        start="2014-01-01", periods=2, freq="1second",
+    ) == [datetime(2014, 1, 1), datetime(2014, 1, 1, 0, 0, 1)]
+
     with raises(Exception):
         generator.time_series()
 
 
+def test_time_series_as_numpy():
+    np = pytest.importorskip("numpy")
+
+    series = generator.time_series(
+        start="2014-01-01 03:00:00",
+        end="2014-01-01 03:12:00",
+        freq="5min",
+        as_numpy=True,
+    )
+    assert series.dtype == np.dtype("datetime64[us]")
+    assert series.tolist() == [
+        datetime(2014, 1, 1, 3, 0, 0),
+        datetime(2014, 1, 1, 3, 5, 0),
+        datetime(2014, 1, 1, 3, 10, 0),
+    ]
+
+    series = generator.time_series(
+        end="2014-01-03 06:00:00", periods=3, freq="1day",
+        return_date=True, as_numpy=True,
+    )
+    assert series.tolist() == [
+        date(2014, 1, 1), date(2014, 1, 2), date(2014, 1, 3)]
+
+
 def test_weekday_series():
     assert generator.weekday_series(
         "2014-01-01 06:30:25",
@@ -97,6 +129,17 @@ def test_rnd_date_array():
     assert len(matrix[0]) == 3
 
 
+def test_rnd_date_array_as_numpy():
+    np = pytest.importorskip("numpy")
+
+    start, end = "2014-01-01", date(2014, 1, 31)
+    array = generator.rnd_date_array((2, 3), start, end, as_numpy=True)
+    assert array.shape == (2, 3)
+    assert array.dtype == np.dtype("datetime64[D]")
+    assert (array >= np.datetime64("2014-01-01")).all()
+    assert (array <= np.datetime64("2014-01-31")).all()
+
+
 def test_rnd_datetime():
     # test random datetime is between the boundary
     dt = generator.rnd_datetime(
@@ -118,6 +161,17 @@ def test_rnd_datetime_array():
     assert len(matrix[0]) == 3
 
 
+def test_rnd_datetime_array_as_numpy():
+    np = pytest.importorskip("numpy")
+
+    start, end = "2014-01-01", datetime(2014, 1, 31, 23, 59, 59)
+    array = generator.rnd_datetime_array(4, start, end, as_numpy=True)
+    assert array.shape == (4,)
+    assert array.dtype == np.dtype("datetime64[us]")
+    assert (array >= np.datetime64("2014-01-01T00:00:00")).all()
+    assert (array <= np.datetime64("2014-01-31T23:59:59")).all()
+
+
 def test_rnd_():
     size = 10000
 
@@ -174,6 +228,12 @@ def test_day_month_year_interval():
         generator._randn("12", generator.rnd_datetime)
 
 
+def test_has_np():
+    from rolex.lazy import import_numpy
+
+    assert generator.has_np is (import_numpy() is not None)
+
+
 if __name__ == "__main__":
     import os
 
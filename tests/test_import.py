@@ -9,6 +9,56 @@ def test():
     pass
 
 
+def test_lazy_import():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, rolex; "
+        "print(sorted(m for m in ['numpy', 'dateutil.parser', 'rolex.parse'] "
+        "if m in sys.modules))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.decode("utf-8").strip() == "[]"
+
+    import rolex
+    assert rolex.str2date("2014-01-15").day == 15
+    assert rolex.utc_to_local is rolex.util.utc_to_local
+    assert "add_days" in dir(rolex)
+    with raises(AttributeError):
+        rolex.not_exists
+
+
+def test_submodule_attribute():
+    import subprocess
+    import sys
+
+    names = ["business", "format", "generator", "lazy", "math", "parse",
+             "tz", "util"]
+    code = (
+        "import rolex; "
+        "print([getattr(rolex, name).__name__ for name in %r])" % names
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.decode("utf-8").strip() == \
+        str(["rolex." + name for name in names])
+
+    import rolex
+    assert rolex.math.add_days is rolex.add_days
+    assert "math" in dir(rolex)
+
+
+def test_star_import():
+    namespace = dict()
+    exec("from rolex import *", namespace)
+    for name in ["str2datetime", "add_days", "parser", "time_series",
+                 "utc", "to_utc", "datetime2str"]:
+        assert name in namespace
+
+    import rolex
+    assert namespace["add_days"] is rolex.math.add_days
+
+
 if __name__ == "__main__":
     import os
 
@@ -3,7 +3,7 @@
 import pytest
 from pytest import raises
 from rolex import math
-from datetime import datetime
+from datetime import date, datetime
 
 
 def test_add_seconds_minutes_hours_days_weeks():
@@ -16,6 +16,34 @@ def test_add_seconds_minutes_hours_days_weeks():
         datetime(2014, 1, 8, 18, 30, 25)
 
 
+def test_add_seconds_many():
+    assert math.add_minutes_many([1389808711, 1389808712], 1) == \
+        [1389808771, 1389808772]
+    assert math.add_seconds_many([1389808711000], 1.5, unit="ms") == \
+        [1389808712500]
+    assert math.add_hours_many([0, 0], [1, 2]) == [3600, 7200]
+    assert math.add_days_many(["2014-01-15", datetime(2014, 1, 15)], 1) == \
+        [datetime(2014, 1, 16), datetime(2014, 1, 16)]
+    assert math.add_weeks_many(["2014-01-15"], [-1]) == [datetime(2014, 1, 8)]
+    with raises(ValueError):
+        math.add_seconds_many([1], 1, unit="m")
+
+
+def test_add_seconds_many_numpy():
+    np = pytest.importorskip("numpy")
+    array = np.array(["2014-01-15T00:00:00", "NaT"], dtype="datetime64[s]")
+    assert math.add_minutes_many(array, 1).astype(str).tolist() == \
+        ["2014-01-15T00:01:00", "NaT"]
+    assert math.add_seconds_many(array, 0.5).astype(str).tolist() == \
+        ["2014-01-15T00:00:00.500000", "NaT"]
+    array = np.array(["2014-01-15"], dtype="datetime64[D]")
+    assert math.add_days_many(array, np.array([2])).astype(str).tolist() == \
+        ["2014-01-17T00:00:00"]
+    epoch = np.array([1389808711, 1389808712], dtype=np.int64)
+    assert math.add_minutes_many(epoch, 1).tolist() == \
+        [1389808771, 1389808772]
+
+
 def test_add_months():
     assert math.add_months("2012-01-31", 1) == datetime(2012, 2, 29)
     assert math.add_months("2012-03-31", -1) == datetime(2012, 2, 29)
@@ -28,6 +56,49 @@ def test_add_months():
     assert math.add_months("2012-12-31", 3) == datetime(2013, 3, 31)
     assert math.add_months("2012-12-31", 4) == datetime(2013, 4, 30)
 
+    assert math.add_months("2012-11-15", 1) == datetime(2012, 12, 15)
+    assert math.add_months("2012-12-15", 0) == datetime(2012, 12, 15)
+
+
+def test_add_months_many():
+    data = ["2012-01-31", "2012-03-31", "2012-12-31", "2012-11-15"]
+    assert math.add_months_many(data, 1) == \
+        [math.add_months(value, 1) for value in data]
+    assert math.add_months_many(data, [1, -1, 2, 1]) == [
+        datetime(2012, 2, 29), datetime(2012, 2, 29),
+        datetime(2013, 2, 28), datetime(2012, 12, 15),
+    ]
+    assert math.add_months_many(data[:1], 1, return_date=True) == \
+        [date(2012, 2, 29)]
+    assert math.add_years_many(["2012-02-29", "2011-02-28"], [1, 1]) == \
+        [datetime(2013, 2, 28), datetime(2012, 2, 28)]
+
+
+def test_add_months_many_numpy():
+    np = pytest.importorskip("numpy")
+    array = np.array(
+        ["2012-01-31T10:30:00.5", "2012-12-31", "NaT"],
+        dtype="datetime64[ms]",
+    )
+    result = math.add_months_many(array, np.array([1, 2, 1]))
+    assert result.dtype == array.dtype
+    assert result.astype(str).tolist() == [
+        "2012-02-29T10:30:00.500", "2013-02-28T00:00:00.000", "NaT"]
+
+    array = np.array(["2012-02-29"], dtype="datetime64[D]")
+    assert math.add_years_many(array, -1).astype(str).tolist() == \
+        ["2011-02-28"]
+
+    # numpy integer scalar on the list path
+    data = ["2012-01-31", "2012-02-29"]
+    assert math.add_months_many(data, np.int64(1)) == \
+        math.add_months_many(data, 1)
+    assert math.add_years_many(data, np.int64(1)) == \
+        math.add_years_many(data, 1)
+    assert math.add_months_many(data, np.array([1, -1])) == \
+        math.add_months_many(data, [1, -1])
+    assert math.add_minutes_many([1389808711], np.int64(1)) == [1389808771]
+
 
 def test_add_years():
     assert math.add_years("2012-02-29", 1) == datetime(2013, 2, 28)
@@ -64,6 +135,105 @@ def test_round_to():
         math.round_to(dt, 8, 0, 0, mode="Unknown")
 
 
+def test_to_freq():
+    dt = datetime(2014, 1, 15, 17, 58, 31)
+    assert math.floor_to_freq(dt, "15min") == datetime(2014, 1, 15, 17, 45)
+    assert math.ceil_to_freq(dt, "15min") == datetime(2014, 1, 15, 18, 0)
+    assert math.round_to_freq(dt, "15min") == datetime(2014, 1, 15, 18, 0)
+    assert math.round_to_freq("2014-01-15 17:52:30", "15min") == \
+        datetime(2014, 1, 15, 17, 45)  # tie is rounded down
+    assert math.floor_to_freq(dt, "1h") == datetime(2014, 1, 15, 17)
+    assert math.ceil_to_freq(datetime(2014, 1, 15), "1day") == \
+        datetime(2014, 1, 15)
+    assert math.floor_to_freq(dt, "1week") == datetime(2014, 1, 13)  # Monday
+    assert math.floor_to_freq(dt, "1month") == datetime(2014, 1, 1)
+    assert math.ceil_to_freq(dt, "3month") == datetime(2014, 4, 1)
+    assert math.round_to_freq(dt, "1month") == datetime(2014, 1, 1)
+    assert math.round_to_freq("2014-01-20", "1month") == datetime(2014, 2, 1)
+    assert math.floor_to_freq(dt, "1year") == datetime(2014, 1, 1)
+
+    with raises(ValueError):
+        math.floor_to_freq(dt, "1fortnight")
+    with raises(ValueError):
+        math.floor_to_freq(dt, "0min")
+
+
+def test_to_freq_many():
+    data = [datetime(2014, 1, 15, 17, 58, 31), datetime(2014, 1, 15, 18, 1)]
+    for freq in ["5min", "1h", "1week", "1month"]:
+        assert math.floor_to_freq_many(data, freq) == \
+            [math.floor_to_freq(value, freq) for value in data]
+        assert math.ceil_to_freq_many(data, freq) == \
+            [math.ceil_to_freq(value, freq) for value in data]
+        assert math.round_to_freq_many(data, freq) == \
+            [math.round_to_freq(value, freq) for value in data]
+
+    assert math.floor_to_freq_many([1389808711, 1389808771], "5min") == \
+        [1389808500, 1389808500]
+    assert math.ceil_to_freq_many([1389808711000], "1min", unit="ms") == \
+        [1389808740000]
+    assert math.floor_to_freq_many([1389808711], "1month") == [1388534400]
+
+
+def test_to_freq_many_numpy():
+    np = pytest.importorskip("numpy")
+    array = np.array(
+        ["2014-01-15T17:58:31.5", "2014-01-15T18:01:00", "NaT"],
+        dtype="datetime64[ms]",
+    )
+    assert math.floor_to_freq_many(array, "5min").astype(str).tolist() == \
+        ["2014-01-15T17:55:00.000", "2014-01-15T18:00:00.000", "NaT"]
+    assert math.round_to_freq_many(array, "1month").astype(str).tolist() == \
+        ["2014-01-01T00:00:00.000", "2014-01-01T00:00:00.000", "NaT"]
+
+    epoch = np.array([1389808711, 1389808771], dtype=np.int64)
+    assert math.floor_to_freq_many(epoch, "5min").tolist() == \
+        [1389808500, 1389808500]
+
+
+def test_diff():
+    assert math.diff_days("2014-01-01", "2014-01-03 23:59:59") == 2
+    assert math.diff_days("2014-01-03 23:59:59", "2014-01-01") == -2
+    assert math.diff_weeks("2014-01-01", "2014-01-15") == 2
+    assert math.diff_weeks("2014-01-15", "2014-01-02") == -1
+    # consistent with add_months clamping
+    assert math.diff_months("2015-01-31", "2015-02-28") == 1
+    assert math.diff_months("2015-01-31", "2015-02-27") == 0
+    assert math.diff_months("2015-03-31", "2015-02-28") == -1
+    assert math.diff_months("2014-01-15 12:00:00", "2014-03-15 11:59:59") == 1
+    assert math.diff_years("2012-02-29", "2013-02-28") == 1
+    assert math.diff_years("1990-06-01", "2014-05-31") == 23
+    assert math.diff_years("2014-05-31", "1990-06-01") == -23
+
+
+def test_diff_many():
+    assert math.diff_months_many(
+        ["2015-01-31", "2015-01-15"], "2015-02-28") == [1, 1]
+    assert math.diff_days_many(
+        [datetime(2014, 1, 1)], [date(2014, 1, 11)]) == [10]
+    assert math.diff_years_many(["2012-02-29"], ["2016-02-28"]) == [3]
+    assert math.diff_weeks_many(["2014-01-01"], ["2014-01-08"]) == [1]
+
+
+def test_diff_many_numpy():
+    np = pytest.importorskip("numpy")
+    starts = np.array(["2015-01-31T00:00:00", "2016-02-29T12:00:00"],
+                      dtype="datetime64[s]")
+    ends = np.array(["2015-02-28", "2015-02-28"], dtype="datetime64[D]")
+    assert math.diff_months_many(starts, ends).tolist() == [1, -12]
+    assert math.diff_years_many(starts, ends).tolist() == [0, -1]
+    assert math.diff_days_many(starts, ends).tolist() == [28, -366]
+    assert math.diff_weeks_many(starts, "2015-02-28").tolist() == [4, -52]
+    with raises(ValueError):
+        math.diff_days_many(np.array(["NaT"], dtype="datetime64[s]"), ends)
+
+
+def test_freq_cache_bounded():
+    for i in range(1, math._freq_cache_size + 10):
+        math._parse_freq("%dmin" % i)
+    assert len(math._freq_cache) <= math._freq_cache_size
+
+
 if __name__ == "__main__":
     import os
 
@@ -4,13 +4,17 @@ from __future__ import print_function
 import pytest
 from pytest import raises
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from dateutil.parser import parse
 from rolex.parse import (
     date_template_and_example,
     datetime_template_and_example,
-    parser,
+    datetime_template_list,
+    Parser, parser,
+    parse_iso8601, parse_epoch, guess_epoch_unit,
 )
+from rolex.template import Template, add_locale
+from rolex.tz import utc
 
 
 def test_template():
@@ -21,11 +25,548 @@ def test_template():
         datetime.strptime(example, tpl)
 
 
+def test_parse_iso8601():
+    assert parse_iso8601("2014-01-15") == datetime(2014, 1, 15)
+    assert parse_iso8601("2014-01-15T17:58") == datetime(2014, 1, 15, 17, 58)
+    assert parse_iso8601("2014-01-15 17:58:31") == \
+        datetime(2014, 1, 15, 17, 58, 31)
+    assert parse_iso8601("2014-01-15T17:58:31.1") == \
+        datetime(2014, 1, 15, 17, 58, 31, 100000)
+    assert parse_iso8601("2014-01-15T17:58:31.123456789") == \
+        datetime(2014, 1, 15, 17, 58, 31, 123456)
+
+    dt = parse_iso8601("2014-01-15T17:58:31Z")
+    assert dt.tzinfo is utc
+    assert dt == datetime(2014, 1, 15, 17, 58, 31, tzinfo=utc)
+
+    dt = parse_iso8601("2014-01-15T17:58:31-04:00")
+    assert dt.utcoffset() == timedelta(hours=-4)
+    assert parse_iso8601("2014-01-15T17:58:31-0400", aware=False) == \
+        datetime(2014, 1, 15, 21, 58, 31)
+    assert parse_iso8601("2014-01-15T17:58:31+05", aware=False) == \
+        datetime(2014, 1, 15, 12, 58, 31)
+
+    for text in [
+        "2014-1-15", "2014-02-30", "2014-01-15 5:58:31",
+        "2014-01-15 05:58 PM", "2014-01-15T17:58:31ZUTC",
+        "2014-01-15T17:58:31.", "2014-01-15T17:58:31+5",
+        "Wed, 15 Jan 2014 17:58:31 GMT",
+    ]:
+        assert parse_iso8601(text) is None
+
+
+def test_parse_epoch():
+    assert guess_epoch_unit(1389808711) == "s"
+    assert guess_epoch_unit(-1389808711123) == "ms"
+    assert guess_epoch_unit(1389808711123456) == "us"
+    assert guess_epoch_unit(1389808711123456789) == "ns"
+
+    expected = datetime(2014, 1, 15, 17, 58, 31)
+    assert parse_epoch(1389808711) == expected
+    assert parse_epoch("1389808711") == expected
+    assert parse_epoch("1389808711123") == \
+        expected.replace(microsecond=123000)
+    assert parse_epoch("1389808711123456") == \
+        expected.replace(microsecond=123456)
+    assert parse_epoch(1389808711123456789) == \
+        expected.replace(microsecond=123456)
+    assert parse_epoch("1389808711.000001") == \
+        expected.replace(microsecond=1)
+    assert parse_epoch("-1") == datetime(1969, 12, 31, 23, 59, 59)
+    assert parse_epoch("1000", unit="ms") == datetime(1970, 1, 1, 0, 0, 1)
+
+    assert parse_epoch("2014-01-15") is None
+    assert parse_epoch("9" * 30, unit="s") is None
+    with raises(ValueError):
+        parse_epoch(1, unit="minute")
+
+
 class TestParser(object):
     def test_str2date(self):
         assert parser.str2date("9/21/2014") == date(2014, 9, 21)
         assert parser._default_date_template == "%m/%d/%Y"
 
+    def test_signature_index(self):
+        p = Parser()
+        assert p.str2datetime("1/15/2014 17:58:31") == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        candidates = p._datetime_signature_index["9/99/9999 99:99:99"]
+        assert [template.template for template in candidates] == \
+            ["%m/%d/%Y %H:%M:%S"]
+        assert p.str2date("Sep 20, 2014") == date(2014, 9, 20)
+
+    def test_str2date_many(self):
+        p = Parser()
+        assert p.str2date_many(["9/21/2014", "9/22/2014", "2014-09-23"]) == \
+            [date(2014, 9, 21), date(2014, 9, 22), date(2014, 9, 23)]
+        assert p.str2date_many(
+            iter(["09202014", "09212014"]), template="%m%d%Y") == \
+            [date(2014, 9, 20), date(2014, 9, 21)]
+        with raises(ValueError):
+            p.str2date_many(["9/21/2014", "1234567890"])
+
+    def test_str2datetime_many(self):
+        p = Parser()
+        assert p.str2datetime_many([
+            "2014-07-13 8:12:34 PM",
+            "2014-07-14 8:12:34 AM",
+            "2014-07-15T08:12:34",
+        ]) == [
+            datetime(2014, 7, 13, 20, 12, 34),
+            datetime(2014, 7, 14, 8, 12, 34),
+            datetime(2014, 7, 15, 8, 12, 34),
+        ]
+        assert p.str2datetime_many(
+            ["2014011506", "2014011507"], template="%Y%m%d%H") == \
+            [datetime(2014, 1, 15, 6), datetime(2014, 1, 15, 7)]
+
+    def test_str2datetime_many_as_numpy(self):
+        np = pytest.importorskip("numpy")
+
+        p = Parser()
+        array = p.str2datetime_many(
+            ["2014-01-15 17:58:31", "2014-01-15T17:58:31Z-0400"],
+            as_numpy=True,
+        )
+        assert array.dtype == np.dtype("datetime64[us]")
+        assert array.tolist() == [
+            datetime(2014, 1, 15, 17, 58, 31),
+            datetime(2014, 1, 15, 21, 58, 31),
+        ]
+
+        array = p.str2date_many(iter(["9/21/2014", "9/22/2014"]),
+                                as_numpy=True)
+        assert array.dtype == np.dtype("datetime64[D]")
+        assert array.tolist() == [date(2014, 9, 21), date(2014, 9, 22)]
+
+    def test_infer_format(self):
+        p = Parser()
+        samples = ["01-02-2014", "01-13-2014", "12-31-2014"]
+        template, confidence = p.infer_format(samples)
+        assert template == "%m-%d-%Y"
+        assert confidence == 1.0
+        assert p.str2datetime_many(samples, template=template)[1] == \
+            datetime(2014, 1, 13)
+
+        template, confidence = p.infer_format(
+            ["2014-01-15 17:58:31", "2014-01-15 17:58", "2014-01-16 17:59"])
+        assert template == "%Y-%m-%d %H:%M"
+        assert confidence == 2.0 / 3
+
+        assert p.infer_format(["hello", "world"]) == (None, 0.0)
+        assert p.infer_format([]) == (None, 0.0)
+
+    def test_str2datetime_iso8601(self):
+        p = Parser()
+        assert p.str2datetime("2014-01-15T17:58:31.1234567Z") == \
+            datetime(2014, 1, 15, 17, 58, 31, 123456, tzinfo=utc)
+        assert p._default_datetime_template == datetime_template_list[0]
+
+        p = Parser(iso_aware=False)
+        assert p.str2datetime("2014-01-15T17:58:31+01:00") == \
+            datetime(2014, 1, 15, 16, 58, 31)
+
+    def test_cache(self):
+        assert Parser().cache_info() is None
+
+        p = Parser(cache_size=2)
+        assert p.str2datetime("2014-01-15 5:58:31 PM") == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        assert p.str2datetime("2014-01-15 5:58:31 PM") == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        assert p.parse_datetime("2014-01-15 5:58:31 PM") == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        assert p.parse_date("9/21/2014") == date(2014, 9, 21)
+        info = p.cache_info()
+        assert info["datetime"]["hits"] == 2
+        assert info["datetime"]["misses"] == 1
+        assert info["date"]["misses"] == 1
+
+        p.str2datetime("2014-01-16 5:58:31 PM")
+        p.str2datetime("2014-01-15 5:58:31 PM")
+        p.str2datetime("2014-01-17 5:58:31 PM")  # evict 2014-01-16
+        assert "2014-01-15 5:58:31 PM" in p.datetime_cache
+        assert "2014-01-16 5:58:31 PM" not in p.datetime_cache
+
+        p.clear_cache()
+        assert p.cache_info()["datetime"]["currsize"] == 0
+
+    def test_str2datetime_epoch(self):
+        p = Parser()
+        expected = datetime(2014, 1, 15, 17, 58, 31)
+        assert p.str2datetime("1389808711") == expected
+        assert p.str2datetime("1389808711.5") == \
+            expected.replace(microsecond=500000)
+        assert p.str2datetime("1389808711123") == \
+            expected.replace(microsecond=123000)
+        assert p.parse_datetime(1389808711123) == \
+            expected.replace(microsecond=123000)
+        assert p.buffer2datetime(b"1389808711123") == \
+            expected.replace(microsecond=123000)
+
+        # compact datetime is not epoch
+        assert p.str2datetime("2014011506") == datetime(2014, 1, 15, 6)
+        assert p.str2datetime("20140115063015") == \
+            datetime(2014, 1, 15, 6, 30, 15)
+
+        p = Parser(epoch_unit="ms")
+        assert p.str2datetime("2014011506") == \
+            datetime(1970, 1, 24, 7, 26, 51, 506000)
+        assert p.parse_datetime(1000) == datetime(1970, 1, 1, 0, 0, 1)
+
+    def test_stats(self):
+        assert Parser().stats() is None
+
+        p = Parser(collect_stats=True)
+        p.str2datetime("2014-01-15T17:58:31")
+        p.str2datetime("2014-07-13 8:12:34 PM")
+        p.str2datetime("2014-07-13 8:12:35 PM")
+        p.parse_datetime("2000-01-01T00:00:00-5")
+        p.str2date("9/21/2014")
+
+        stats = p.stats()["datetime"]
+        assert stats["calls"] == 4
+        assert stats["template_hits"] == {
+            "iso8601": 1, "%Y-%m-%d %I:%M:%S %p": 2,
+        }
+        assert stats["default_misses"] == 2
+        assert stats["rescans"] == 2
+        assert stats["fallbacks"] == 1
+        assert sum(stats["latency_histogram"].values()) == 4
+        assert p.stats()["date"]["template_hits"] == {"%m/%d/%Y": 1}
+
+        p.reset_stats()
+        assert p.stats()["datetime"]["calls"] == 0
+
+    def test_stats_many(self):
+        p = Parser(collect_stats=True)
+        p.str2datetime_many(["2014-01-15 17:58:31"] * 50)
+        stats = p.stats()["datetime"]
+        assert stats["calls"] == 50
+        assert sum(stats["template_hits"].values()) == 50
+        assert sum(stats["latency_histogram"].values()) == 1
+
+        p.reset_stats()
+        p.str2datetime_many(["2014-01-15 17:58:31"] * 5 + ["x"],
+                            errors="coerce")
+        assert p.stats()["datetime"]["calls"] == 6
+
+        p.str2date_many(["2014-01-15"] * 10, template="%Y-%m-%d")
+        assert p.stats()["date"]["calls"] == 10
+        assert p.stats()["date"]["template_hits"] == {"%Y-%m-%d": 10}
+
+    def test_parse_many(self):
+        data = [
+            "2014-01-15 5:58:31 PM",
+            "2014-01-15 6:00:00 PM",
+            "2014-01-15T18:01:00.5-01:00",
+            "1/15/2014 18:01:00",
+        ] * 5
+        expected = [
+            datetime(2014, 1, 15, 17, 58, 31),
+            datetime(2014, 1, 15, 18, 0, 0),
+            datetime(2014, 1, 15, 19, 1, 0, 500000),
+            datetime(2014, 1, 15, 18, 1, 0),
+        ] * 5
+
+        p = Parser()
+        assert p.parse_many(data) == expected
+        assert p.parse_many(data, workers=2, chunksize=3) == expected
+        epoch = p.parse_many(data, workers=2, chunksize=3, epoch=True)
+        assert epoch.typecode == "q"
+        assert epoch[0] == 1389808711000000
+
+        # compiled template is sent to workers as template string
+        assert p.parse_many(
+            ["2014-01-15", "2014-01-16"], workers=2, chunksize=1,
+            template=Template("%Y-%m-%d"),
+        ) == [datetime(2014, 1, 15), datetime(2014, 1, 16)]
+
+    def test_buffer2datetime(self):
+        p = Parser()
+        data = b"id=1 time=2014-01-15 5:58:31 PM;"
+        assert p.buffer2datetime(data, 10, 21) == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        assert p._default_datetime_template == "%Y-%m-%d %I:%M:%S %p"
+        assert p.buffer2datetime(memoryview(data), 10, 21) == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        assert p.buffer2datetime(b"2014-01-15T17:58:31Z") == \
+            datetime(2014, 1, 15, 17, 58, 31, tzinfo=utc)
+        assert p.buffer2date(bytearray(b"Sep 20, 2014")) == date(2014, 9, 20)
+
+        assert p.parse_datetime(b"2014-01-15 17:58:31") == \
+            datetime(2014, 1, 15, 17, 58, 31)
+        assert p.parse_date(bytearray(b"9/21/2014")) == date(2014, 9, 21)
+
+    def test_buffer2datetime_many(self, tmpdir):
+        import mmap
+
+        p = Parser()
+        path = tmpdir.join("fixed_width.txt")
+        path.write_binary(
+            b"2014-01-15 17:58:31|"
+            b"2014-01-15 17:58:32|"
+            b"01/15/2014 17:58:33|"
+        )
+        with open(str(path), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            assert p.buffer2datetime_many(buffer, [0, 20, 40], 19) == [
+                datetime(2014, 1, 15, 17, 58, 31),
+                datetime(2014, 1, 15, 17, 58, 32),
+                datetime(2014, 1, 15, 17, 58, 33),
+            ]
+            buffer.close()
+
+    def test_iter_file(self, tmpdir):
+        p = Parser()
+
+        path = tmpdir.join("events.csv")
+        path.write(
+            "id,value,time\n"
+            "1,a,2014-01-15 5:58:31 PM\n"
+            "2,b,2014-01-15 6:00:00 PM\n"
+            "\n"
+            "3,c,1/15/2014 18:01:00\n"
+        )
+        assert list(p.iter_file(str(path), column=2, skip_header=True)) == [
+            datetime(2014, 1, 15, 17, 58, 31),
+            datetime(2014, 1, 15, 18, 0, 0),
+            datetime(2014, 1, 15, 18, 1, 0),
+        ]
+        assert list(p.iter_file(
+            str(path), column=2, skip_header=True, epoch=True,
+            template="%Y-%m-%d %I:%M:%S %p",
+        ))[0] == 1389808711
+
+        path = tmpdir.join("app.log")
+        path.write(
+            "[2014-01-15 17:58:31] INFO start\n"
+            "Traceback (most recent call last):\n"
+            "[2014-01-15 17:58:32] ERROR failed\n"
+        )
+        with open(str(path)) as f:
+            assert list(p.iter_file(f, pattern=r"^\[(.+?)\]")) == [
+                datetime(2014, 1, 15, 17, 58, 31),
+                datetime(2014, 1, 15, 17, 58, 32),
+            ]
+
+        path = tmpdir.join("timestamps.txt")
+        path.write("20140115063015\n\n20140115063016\n")
+        assert len(list(p.iter_file(str(path)))) == 2
+
+    def test_template_registry(self):
+        p = Parser(datetime_templates=[("%d.%m.%Y %H:%M", "15.01.2014 17:58")])
+        assert p.datetime_templates.templates == ["%d.%m.%Y %H:%M"]
+        assert p.str2datetime("15.01.2014 17:58") == \
+            datetime(2014, 1, 15, 17, 58)
+
+        p.datetime_templates.add("%Y/%m/%d %H:%M", "2014/01/15 17:58",
+                                 priority=1)
+        assert p.str2datetime("2014/01/15 17:58") == \
+            datetime(2014, 1, 15, 17, 58)
+        assert p._default_datetime_template == "%Y/%m/%d %H:%M"
+
+        # removing the remembered default template
+        p.datetime_templates.remove("%Y/%m/%d %H:%M")
+        assert p._default_datetime_template == "%d.%m.%Y %H:%M"
+        assert p.str2datetime("2014/01/15 17:58") == \
+            datetime(2014, 1, 15, 17, 58)  # dateutil fallback
+
+        # other parsers are not affected
+        assert "%d.%m.%Y %H:%M" not in parser.datetime_templates
+        assert len(parser.datetime_templates) == len(datetime_template_list)
+
+        # empty registry
+        p = Parser(date_templates=[])
+        assert p._default_date_template is None
+        with raises(ValueError):
+            p.str2date("2014-01-15")
+
+    def test_template_list_snapshot(self):
+        # module level template lists are read when a Parser is created,
+        # templates are added to the registry instead
+        p = Parser()
+        datetime_template_list.append("%Y!!%m!!%d")
+        try:
+            assert "%Y!!%m!!%d" not in p.datetime_templates
+        finally:
+            datetime_template_list.remove("%Y!!%m!!%d")
+        p.datetime_templates.add("%Y!!%m!!%d", "2014!!01!!15")
+        assert p.str2datetime("2014!!01!!15") == datetime(2014, 1, 15)
+
+    def test_tzinfo_intern(self):
+        a = parser.str2datetime("2014-01-15T17:58:31+05:00")
+        b = parser.str2datetime("2014-01-16T17:58:31+0500")
+        assert a.tzinfo is b.tzinfo
+        a = parser.str2datetime("2014-01-15T17:58:31Z-0400")
+        b = parser.str2datetime("2014-01-16T17:58:31Z-04:00")
+        assert a.tzinfo is b.tzinfo
+        assert a.utcoffset() == timedelta(hours=-4)
+
+        # zero offset is always rolex.tz.utc, however it's spelled
+        template = Template("%Y-%m-%d %H:%M:%S%z")
+        for a_datetime in [
+            parser.str2datetime("2014-01-15T17:58:31Z"),
+            parser.str2datetime("2014-01-15T17:58:31+00:00"),
+            parser.str2datetime("2014-01-15T17:58:31+0000"),
+            template.match("2014-01-15 17:58:31Z"),
+            template.match("2014-01-15 17:58:31+00:00"),
+            template.match("2014-01-15 17:58:31+0000"),
+            template.match("2014-01-15 17:58:31-0000"),
+        ]:
+            assert a_datetime.tzinfo is utc
+
+    def test_normalize_utc(self):
+        p = Parser(normalize_utc=True)
+        for datetime_str in [
+            "2014-01-15T22:58:31+05:00",
+            "2014-01-15T13:58:31Z-0400",
+            "Wed, 15 Jan 2014 17:58:31 +0000 (UTC)",
+        ]:
+            a_datetime = p.str2datetime(datetime_str)
+            assert a_datetime.tzinfo is utc
+            assert a_datetime.replace(tzinfo=None) == \
+                datetime(2014, 1, 15, 17, 58, 31)
+        assert p.str2datetime("2014-01-15 17:58:31").tzinfo is None
+        assert p.str2datetime_many(
+            ["2014-01-15T13:58:31Z-0400", "2014-01-15T14:58:31Z-0300"],
+            template="%Y-%m-%dT%H:%M:%SZ%z",
+        ) == [datetime(2014, 1, 15, 17, 58, 31, tzinfo=utc)] * 2
+        assert p.buffer2datetime(b"2014-01-15T13:58:31Z-0400").tzinfo is utc
+
+    def test_locales(self):
+        add_locale(
+            "de",
+            ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli",
+             "August", "September", "Oktober", "November", "Dezember"],
+            ["Jan", "Feb", "Mär", "Apr", "Mai", "Jun", "Jul", "Aug", "Sep",
+             "Okt", "Nov", "Dez"],
+            ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag",
+             "Samstag", "Sonntag"],
+            ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"],
+        )
+        p = Parser(locales=["de"])
+        assert p.str2date("Dezember 15, 2014") == date(2014, 12, 15)
+        assert p.str2datetime("Mi, 15 Okt 2014 17:58:31 GMT") == \
+            datetime(2014, 10, 15, 17, 58, 31)
+        assert p.str2datetime_many(
+            ["15. März 2014", "16. Mai 2014"], template="%d. %B %Y",
+        ) == [datetime(2014, 3, 15), datetime(2014, 5, 16)]
+        assert parser.str2date("December 15, 2014") == date(2014, 12, 15)
+
+    def test_many_epoch(self):
+        # compact datetime and epoch strings mixed, bulk equals scalar
+        data = ["201401150630", "1389808711", "20140115063000",
+                "1389808711.5", "1389808711123"]
+        expected = [Parser().str2datetime(text) for text in data]
+        assert expected[1] == datetime(2014, 1, 15, 17, 58, 31)
+        assert Parser().str2datetime_many(data) == expected
+        assert Parser().parse_datetime_many(data) == expected
+
+        buffer = "".join(data).encode("ascii")
+        lengths = [len(text) for text in data]
+        offsets = [sum(lengths[:i]) for i in range(len(data))]
+        assert Parser().buffer2datetime_many(buffer, offsets, lengths) == \
+            expected
+
+        p = Parser()
+        p.str2datetime("201401150630")
+        assert p.buffer2datetime(b"1389808711.5") == \
+            datetime(2014, 1, 15, 17, 58, 31, 500000)
+
+    def test_many_errors(self):
+        data = ["2014-01-15 17:58:31", "N/A", None, "2014-13-45 1:1:1",
+                "2014-01-16 17:58:31"]
+        values, mask = parser.str2datetime_many(data, errors="coerce")
+        assert values == [datetime(2014, 1, 15, 17, 58, 31), None, None, None,
+                          datetime(2014, 1, 16, 17, 58, 31)]
+        assert list(mask) == [0, 1, 1, 1, 0]
+
+        values, mask = parser.str2datetime_many(data, errors="ignore")
+        assert values[1:4] == data[1:4]
+        assert list(mask) == [0, 1, 1, 1, 0]
+
+        values, mask = parser.str2date_many(
+            ["2014-01-15", "hello", "2014-01-16"], errors="coerce")
+        assert values == [date(2014, 1, 15), None, date(2014, 1, 16)]
+        assert list(mask) == [0, 1, 0]
+
+        with raises(ValueError):
+            parser.str2date_many(["2014-01-15", "hello"])
+        with raises(ValueError):
+            parser.str2date_many(["2014-01-15"], errors="skip")
+
+    def test_many_errors_fallback(self, monkeypatch):
+        import rolex.parse
+
+        # only dateutil can parse it
+        data = ["2014-01-15 17:58:31", "2000-01-01T00:00:00-5"]
+        p = Parser()
+        values, mask = p.str2datetime_many(data, errors="coerce",
+                                           fallback=True)
+        assert list(mask) == [0, 0]
+        values, mask = p.parse_datetime_many(
+            ["Jan 15 2014 5pm", b"Jan 15 2014 5pm"], errors="coerce",
+            fallback=True)
+        assert values[0] == values[1] == datetime(2014, 1, 15, 17)
+        assert list(mask) == [0, 0]
+
+        def dateutil_parse(*args, **kwargs):
+            raise AssertionError("dateutil should not be called")
+
+        monkeypatch.setattr(rolex.parse, "dateutil_parse", dateutil_parse)
+        p = Parser()
+        values, mask = p.str2datetime_many(data, errors="coerce")
+        assert values[1] is None
+        assert list(mask) == [0, 1]
+        values, mask = p.parse_datetime_many(data, errors="ignore")
+        assert values[1] == data[1]
+        assert list(mask) == [0, 1]
+
+        # bytes like objects follow the same rule
+        data = ["Jan 15 2014 5pm", b"Jan 15 2014 5pm", b"2014-01-15 17:58:31",
+                bytearray(b"\xff\xfe")]
+        values, mask = p.parse_datetime_many(data, errors="coerce")
+        assert values[2] == datetime(2014, 1, 15, 17, 58, 31)
+        assert list(mask) == [1, 1, 0, 1]
+
+    def test_many_errors_numpy(self):
+        pytest.importorskip("numpy")
+        values, mask = parser.str2datetime_many(
+            ["2014-01-15 17:58:31", "N/A"], errors="coerce", as_numpy=True)
+        assert str(values[0]) == "2014-01-15T17:58:31.000000"
+        assert str(values[1]) == "NaT"
+        assert mask.dtype == bool
+        assert mask.tolist() == [False, True]
+
+    def test_parse_datetime_many(self):
+        values = [
+            "2014-01-15 17:58:31", 1389808711, 1389808711123, -1389808711123,
+            1.5, date(2014, 1, 1), datetime(2014, 1, 2),
+            b"2014-01-15 17:58:31", True, "2014-01-16 17:58:31",
+        ]
+        assert parser.parse_datetime_many(values) == \
+            [parser.parse_datetime(value) for value in values]
+
+        with raises(TypeError):
+            parser.parse_datetime_many(["2014-01-15", None])
+
+        values, mask = parser.parse_datetime_many(
+            [None, "hello", float("nan"), 10 ** 30, 5], errors="coerce")
+        assert values == [None] * 4 + [datetime(1970, 1, 1, 0, 0, 5)]
+        assert list(mask) == [1, 1, 1, 1, 0]
+
+        # out of range floats and integers
+        values = [1e300, -1e300, 3e11, -1e12, float("inf"), 10 ** 30,
+                  -10 ** 30, 253402300799.0, 1.5]
+        for errors in ["coerce", "ignore"]:
+            results, mask = parser.parse_datetime_many(values, errors=errors)
+            assert list(mask) == [1, 1, 1, 1, 1, 1, 1, 0, 0]
+            assert results[-2:] == [datetime(9999, 12, 31, 23, 59, 59),
+                                    datetime(1970, 1, 1, 0, 0, 1, 500000)]
+        with raises(OverflowError):
+            parser.parse_datetime_many([1e300])
+
     def test_str2date_error(self):
         with raises(ValueError):
             parser.str2date("1234567890")
@@ -34,17 +575,46 @@ class TestParser(object):
         assert parser.str2datetime(
             "2014-07-13 8:12:34 PM") == datetime(2014, 7, 13, 20, 12, 34)
         assert parser._default_datetime_template == "%Y-%m-%d %I:%M:%S %p"
-        assert parser.str2datetime.__name__ == "_str2datetime"
 
         # When rolex failed to parse date time string,
-        # then start using dateutil.parser.parse
+        # then use dateutil.parser.parse for this string only
         assert isinstance(parser.str2datetime("2000-01-01T00:00:00-5"),
                           datetime)
-        assert parser.str2datetime.__name__ == "parse"
+        assert parser._circuit_open is False
+
+    def test_fallback_circuit(self):
+        p = Parser(fallback_threshold=2, fallback_reprobe=2)
+        assert p.str2datetime("2000-01-01T00:00:00-5").year == 2000
+        assert p._circuit_open is False
+        assert p.str2datetime("2000-01-02T00:00:00-5").day == 2
+        assert p._circuit_open is True
+
+        # dateutil is used directly, then re-probe templates
+        assert p.str2datetime("2014-07-13 8:12:34 PM") == \
+            datetime(2014, 7, 13, 20, 12, 34)
+        assert p.str2datetime("2014-07-13 8:12:35 PM") == \
+            datetime(2014, 7, 13, 20, 12, 35)
+        assert p._circuit_open is True
+        assert p.str2datetime("2014-07-13 8:12:36 PM") == \
+            datetime(2014, 7, 13, 20, 12, 36)
+        assert p._circuit_open is False
 
         # You can use .reset() method to restore default behavior
-        parser.reset()
-        assert parser.str2datetime.__name__ == "_str2datetime"
+        p.str2datetime("2000-01-01T00:00:00-5")
+        p.str2datetime("2000-01-01T00:00:00-5")
+        assert p._circuit_open is True
+        p.reset()
+        assert p._circuit_open is False
+
+    def test_fallback_circuit_fast_path(self):
+        # open circuit only bypasses the templates, not iso 8601 and epoch
+        p = Parser(fallback_threshold=1)
+        p.str2datetime("2000-01-01T00:00:00-5")
+        assert p._circuit_open is True
+        assert p.str2datetime("1389808711123") == \
+            datetime(2014, 1, 15, 17, 58, 31, 123000)
+        assert p.str2datetime("2014-01-15T17:58:31Z").tzinfo is utc
+        assert p._circuit_open is True
 
     def test_performance(self):
         """Test Result:
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from rolex.stats import ParserStats
+
+
+def test_parser_stats():
+    stats = ParserStats()
+    stats.hit("%Y-%m-%d")
+    stats.hit("%Y-%m-%d")
+    stats.record_latency(0.0000005)
+    stats.record_latency(0.000003)
+    stats.record_latency(1.0)
+
+    data = stats.to_dict()
+    assert data["calls"] == 3
+    assert data["template_hits"] == {"%Y-%m-%d": 2}
+    histogram = data["latency_histogram"]
+    assert histogram["<=1us"] == 1
+    assert histogram["<=5us"] == 1
+    assert histogram[">10000us"] == 1
+
+    stats.reset()
+    assert stats.to_dict()["calls"] == 0
+    assert stats.template_hits == {}
+
+
+if __name__ == "__main__":
+    import os
+
+    basename = os.path.basename(__file__)
+    pytest.main([basename, "-s", "--tb=native"])
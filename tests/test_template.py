@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import random
+import pytest
+from pytest import raises
+
+from datetime import datetime
+from rolex.template import Template, TemplateRegistry, add_locale, signature
+from rolex.parse import datetime_template_and_example
+
+
+def test_example():
+    for tpl, example in datetime_template_and_example:
+        assert Template(tpl).match(example) == \
+            datetime.strptime(example, tpl)
+
+
+def test_same_as_strptime():
+    for tpl, example in datetime_template_and_example:
+        if "%Z" in tpl or "%z" in tpl:
+            continue
+        template = Template(tpl)
+        for _ in range(20):
+            dt = datetime(
+                random.randint(1970, 2030), random.randint(1, 12),
+                random.randint(1, 28), random.randint(0, 23),
+                random.randint(0, 59), random.randint(0, 59),
+                random.randint(0, 999999),
+            )
+            text = dt.strftime(tpl)
+            assert template.match(text) == datetime.strptime(text, tpl)
+            assert template.could_match(signature(text))
+
+
+def test_signature():
+    assert signature("2014-01-15 5:58:31 PM") == "9999-99-99 9:99:99 aa"
+    for tpl, example in datetime_template_and_example:
+        assert Template(tpl).could_match(signature(example))
+
+    template = Template("%Y-%m-%d %H:%M:%S")
+    assert template.could_match(signature("2014-01-15 17:58:31"))
+    assert not template.could_match(signature("2014-01-15T17:58:31"))
+    assert not template.could_match(signature("1/15/2014 17:58:31"))
+
+
+def test_signature_native_str():
+    # byte string on Python 2
+    text = str("2014-01-15 5:58:31 PM")
+    assert signature(text) == signature(u"2014-01-15 5:58:31 PM") == \
+        "9999-99-99 9:99:99 aa"
+    assert signature(b"2014-01-15") == b"9999-99-99"
+
+    from rolex.parse import Parser
+    assert Parser().str2datetime(str("2014-01-15 5:58:31 PM")) == \
+        datetime(2014, 1, 15, 17, 58, 31)
+
+
+def test_miss():
+    template = Template("%Y-%m-%d %H:%M:%S")
+    assert template.match("2014-01-15 17:58") is None
+    assert template.match("2014-01-15 17:58:31 PM") is None
+    assert template.match("2014-02-30 17:58:31") is None
+
+    template = Template("%I:%M %p %m/%d/%Y")
+    assert template.match("05:58 pm 1/15/2014") == \
+        datetime(2014, 1, 15, 17, 58)
+    assert template.match("12:00 AM 1/15/2014") == datetime(2014, 1, 15)
+
+
+def test_match_buffer():
+    for tpl, example in datetime_template_and_example:
+        data = b"|" + example.encode("utf-8") + b"|"
+        assert Template(tpl).match_buffer(data, 1, len(data) - 1) == \
+            datetime.strptime(example, tpl)
+
+    template = Template("%Y-%m-%d %H:%M:%S")
+    assert template.match_buffer(bytearray(b"2014-01-15 17:58:31")) == \
+        datetime(2014, 1, 15, 17, 58, 31)
+    assert template.match_buffer(b"2014-01-15 17:58:31", 1) is None
+
+
+def test_invalid_template():
+    with raises(ValueError):
+        Template("%Y-%m-%d %Q")
+    with raises(ValueError):
+        Template("%Y-%m-%d %")
+
+
+german = (
+    ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli",
+     "August", "September", "Oktober", "November", "Dezember"],
+    ["Jan", "Feb", "Mär", "Apr", "Mai", "Jun", "Jul", "Aug", "Sep",
+     "Okt", "Nov", "Dez"],
+    ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag",
+     "Samstag", "Sonntag"],
+    ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"],
+)
+
+
+def test_name_tokens():
+    template = Template("%a, %d %b %Y %H:%M:%S GMT")
+    assert template.match("wed, 15 JAN 2014 17:58:31 GMT") == \
+        datetime(2014, 1, 15, 17, 58, 31)
+    assert template.match_buffer(b"Wed, 15 jan 2014 17:58:31 GMT") == \
+        datetime(2014, 1, 15, 17, 58, 31)
+    assert Template("%B %d, %Y").match("September 15, 2014") == \
+        datetime(2014, 9, 15)
+    assert Template("%B %d, %Y").match("Sep 15, 2014") is None
+
+    add_locale("de", *german)
+    template = Template("%A, %d. %B %Y", locales=["de"])
+    assert template.match("Mittwoch, 15. märz 2014") == datetime(2014, 3, 15)
+    assert template.match("Wednesday, 15. March 2014") == \
+        datetime(2014, 3, 15)
+    assert template.match_buffer(u"Mittwoch, 15. März 2014".encode("utf-8")) \
+        == datetime(2014, 3, 15)
+    assert template.could_match(signature(u"Mittwoch, 15. März 2014"))
+    assert Template("%A, %d. %B %Y").match("Mittwoch, 15. März 2014") is None
+
+    with raises(ValueError):
+        Template("%B %Y", locales=["xx"])
+    with raises(ValueError):
+        add_locale("xx", german[0][:11], *german[1:])
+
+
+def test_template_registry():
+    changes = list()
+    registry = TemplateRegistry(
+        ["%Y-%m-%d", ("%m/%d/%Y", "01/15/2014")],
+        on_change=lambda: changes.append(1),
+    )
+    assert registry.templates == ["%Y-%m-%d", "%m/%d/%Y"]
+    assert "%Y-%m-%d" in registry
+    assert len(registry) == 2
+    assert changes == []
+
+    template = registry.add("%d.%m.%Y", "15.01.2014", priority=10)
+    assert isinstance(template, Template)
+    assert registry.templates[0] == "%d.%m.%Y"
+    assert registry.get("%d.%m.%Y") is template
+    assert registry.get("%Y") is None
+    assert len(changes) == 1
+
+    registry.set_priority("%m/%d/%Y", 20)
+    assert registry.templates == ["%m/%d/%Y", "%d.%m.%Y", "%Y-%m-%d"]
+
+    registry.reorder(["%Y-%m-%d"])
+    assert registry.templates == ["%Y-%m-%d", "%m/%d/%Y", "%d.%m.%Y"]
+
+    registry.remove("%m/%d/%Y")
+    assert registry.templates == ["%Y-%m-%d", "%d.%m.%Y"]
+    assert len(changes) == 4
+
+    with raises(ValueError):
+        registry.add("%Y-%m-%d %H", "2014/01/15 17")
+    with raises(KeyError):
+        registry.remove("%m/%d/%Y")
+    with raises(KeyError):
+        registry.reorder(["%m/%d/%Y"])
+
+
+if __name__ == "__main__":
+    import os
+
+    basename = os.path.basename(__file__)
+    pytest.main([basename, "-s", "--tb=native"])